@@ -1,6 +1,11 @@
 """AIEngineer package for automated software development."""
 
+import logging
+
 from .core import Core
 from .system_prompts import SystemPrompts
 
+# Leave log handling to the host application, see logging_config.configure_logging
+logging.getLogger(__name__).addHandler(logging.NullHandler())
+
 __all__ = ["Core", "SystemPrompts"]
@@ -4,51 +4,16 @@ processing the AI model's response, and handling the conversation history.
 """
 
 from datetime import datetime
+import hashlib
 import json
 import re
 import os
 import fnmatch
+from .project_tree import ProjectTree
 from .system_prompts import SystemPrompts
-import logging.config
-
-# Define the logging configuration dictionary
-logging_config = {
-    "version": 1,  # Required
-    "disable_existing_loggers": False,  # Keeps existing loggers active
-    # Formatters specify the layout of the log messages
-    "formatters": {
-        "standard": {"format": "%(asctime)s - %(name)s - %(levelname)s - %(message)s"},
-        "detailed": {
-            "format": "%(asctime)s - %(name)s - %(levelname)s - %(filename)s:%(lineno)d - %(message)s"
-        },
-    },
-    # Handlers direct log messages to a particular destination
-    "handlers": {
-        "console": {
-            "class": "logging.StreamHandler",
-            "level": "DEBUG",
-            "formatter": "standard",
-        },
-        "file": {
-            "class": "logging.FileHandler",
-            "level": "DEBUG",
-            "formatter": "detailed",
-            "filename": "app.log",
-            "mode": "a",  # Append mode
-        },
-    },
-    # Loggers capture log messages and route them to handlers
-    "loggers": {
-        "": {  # Root logger
-            "level": "INFO",
-            "handlers": ["console", "file"],
-            "propagate": False,  # Prevent log messages from propagating to the root logger
-        },
-    },
-}
-
-# Apply the logging configuration
-logging.config.dictConfig(logging_config)
+from .tracing import tracer
+import logging
+
 logger = logging.getLogger(__name__)
 
 
@@ -202,21 +167,23 @@ class Core:
             if fnmatch.fnmatch(path, pattern):
                 logger.debug("Path %s matches ignore pattern: %s", path, pattern)
                 return True
-        logger.debug("Path %s does not match any ignore patterns.", path)
         return False
 
-    def ai_engineer_build_dir_structure(self, root_dir, ignore_file_path=""):
+    def ai_engineer_build_project_tree(
+        self, root_dir, ignore_file_path="", hash_contents=False
+    ):
         """
-        Build a directory structure representation of the project.
+        Build a compact tree representation of the project.
 
         Args:
             root_dir (str): The root directory to analyze.
             ignore_file_path (str, optional): Path to a file with ignore patterns.
+            hash_contents (bool, optional): Record a SHA-256 digest of every file.
 
         Returns:
-            dict: A dictionary representing the directory structure.
+            ProjectTree: The files and directories that are not ignored.
         """
-        dir_structure = {}
+        project_tree = ProjectTree()
 
         ignore_patterns = ["ai_engineer_output*", ".gitignore"]
         if ignore_file_path:
@@ -225,37 +192,76 @@ class Core:
                     self.ai_engineer_read_ignore_file(ignore_file_path)
                 )
 
-        for dirpath, dirnames, filenames in os.walk(root_dir):
-            rel_path = os.path.relpath(dirpath, root_dir)
-            parts = rel_path.split(os.sep)
-            current_level = dir_structure
-
-            for part in parts:
-                if part != ".":
-                    current_level = current_level.setdefault(part, {})
-
-            # Filter out directories that should be ignored
-            dirnames[:] = [
-                d
-                for d in dirnames
-                if not self.ai_engineer_should_ignore(
-                    os.path.join(rel_path, d) if rel_path != "." else d, ignore_patterns
-                )
-            ]
+        dir_indices = {".": 0}
+        with tracer.span("scan_directories", "scan", root_dir=root_dir):
+            for dirpath, dirnames, filenames in os.walk(root_dir):
+                rel_path = os.path.relpath(dirpath, root_dir)
+                if rel_path != ".":
+                    parent_path, dirname = os.path.split(rel_path)
+                    dir_indices[rel_path] = project_tree.ai_engineer_add_node(
+                        dir_indices[parent_path or "."], dirname
+                    )
+                current_index = dir_indices[rel_path]
+
+                with tracer.span("match_ignore_patterns", "ignore", dir=rel_path):
+                    # Filter out directories that should be ignored
+                    dirnames[:] = [
+                        d
+                        for d in dirnames
+                        if not self.ai_engineer_should_ignore(
+                            os.path.join(rel_path, d) if rel_path != "." else d,
+                            ignore_patterns,
+                        )
+                    ]
+
+                    kept_filenames = [
+                        filename
+                        for filename in filenames
+                        if not self.ai_engineer_should_ignore(
+                            (
+                                os.path.join(rel_path, filename)
+                                if rel_path != "."
+                                else filename
+                            ),
+                            ignore_patterns,
+                        )
+                    ]
+
+                # Add files to the structure if they should not be ignored
+                for filename in kept_filenames:
+                    digest = None
+                    if hash_contents:
+                        file_path = os.path.join(dirpath, filename)
+                        with tracer.span("hash_file", "scan", file=file_path):
+                            with open(file_path, "rb") as f:
+                                digest = hashlib.file_digest(f, "sha256").digest()
+                    project_tree.ai_engineer_add_node(
+                        current_index, filename, is_file=True, digest=digest
+                    )
 
-            # Add files to the structure if they should not be ignored
-            for filename in filenames:
-                if not self.ai_engineer_should_ignore(
-                    os.path.join(rel_path, filename) if rel_path != "." else filename,
-                    ignore_patterns,
-                ):
-                    current_level[filename] = None
+        logger.info(
+            "Built project tree of %d files for root directory: %s",
+            len(project_tree.files),
+            root_dir,
+        )
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Project tree:\n%s", project_tree.ai_engineer_encode())
+        return project_tree
 
-        dir_structure = {"project_root": dir_structure}
+    def ai_engineer_build_dir_structure(self, root_dir, ignore_file_path=""):
+        """
+        Build a directory structure representation of the project.
 
-        logger.info("Built directory structure for root directory: %s", root_dir)
-        logger.debug("Directory structure: %s", json.dumps(dir_structure, indent=4))
-        return dir_structure
+        Args:
+            root_dir (str): The root directory to analyze.
+            ignore_file_path (str, optional): Path to a file with ignore patterns.
+
+        Returns:
+            dict: A dictionary representing the directory structure.
+        """
+        return self.ai_engineer_build_project_tree(
+            root_dir, ignore_file_path
+        ).ai_engineer_to_dict()
 
     def ai_engineer_flatten_dir_structure(self, dir_structure, base_path=""):
         """
@@ -269,14 +275,19 @@ class Core:
             dict: A flattened dictionary with file paths.
         """
         flat_dict = {}
+        stack = [(base_path, iter(dir_structure.items()))]
 
-        for name, content in dir_structure.items():
-            current_path = os.path.join(base_path, name)
+        while stack:
+            path, items = stack[-1]
+            item = next(items, None)
+            if item is None:
+                stack.pop()
+                continue
+            name, content = item
+            current_path = f"{path}/{name}" if path else name
 
             if isinstance(content, dict) and content:  # If it's a non-empty directory
-                flat_dict.update(
-                    self.ai_engineer_flatten_dir_structure(content, current_path)
-                )
+                stack.append((current_path, iter(content.items())))
             else:
                 flat_dict[current_path] = content  # File or empty directory
 
@@ -297,10 +308,32 @@ class Core:
             logger.info("Created output directory for conversation history.")
 
         file_path = f"{self.project_root}/ai_engineer_output/{file_prefix}_{self.init_time.strftime('%Y%m%d%H%M%S')}.json"
-        with open(file_path, "w+", encoding="utf-8") as f:
-            f.write(json.dumps(self.ai_engineer_conversation_history, indent=4))
-            logger.info("Exported conversation history to: %s", file_path)
+        with tracer.span("export_conversation_history", "write"):
+            with open(file_path, "w+", encoding="utf-8") as f:
+                f.write(json.dumps(self.ai_engineer_conversation_history, indent=4))
+                logger.info("Exported conversation history to: %s", file_path)
+
+    def ai_engineer_export_profile(self, profile, file_prefix="ai_engineer_profile"):
+        """
+        Export cProfile statistics next to the conversation history.
+
+        Args:
+            profile (Profiler): The finished profiling session.
+            file_prefix (str): Prefix for the output file name.
 
+        Returns:
+            str: Path of the exported .prof file.
+        """
+        if not os.path.exists(f"{self.project_root}/ai_engineer_output"):
+            os.makedirs(f"{self.project_root}/ai_engineer_output")
+            logger.info("Created output directory for profile.")
+
+        file_path = f"{self.project_root}/ai_engineer_output/{file_prefix}_{self.init_time.strftime('%Y%m%d%H%M%S')}.prof"
+        profile.dump_stats(file_path)
+        logger.info("Exported profile to: %s", file_path)
+        return file_path
+
+    @tracer.traced("parse")
     def ai_engineer_parse_response(self, response):
         """
         Extract code from the AI model's response.
@@ -324,13 +357,18 @@ class Core:
                 file_content_match.group(1).strip()
             )
             if len(code_blocks) > 1:
-                logging.error(
+                logger.error(
                     "Unexpected response from AI model. Auto context: multiple code blocks detected. Picking first one. Please check the conversation history under ai_engineer_output"
                 )
-            file_content = code_blocks[0]
+            if code_blocks:
+                file_content = code_blocks[0]
+            else:
+                logger.error(
+                    "Unexpected response from AI model. Auto context: no complete code block detected. Please check the conversation history under ai_engineer_output"
+                )
 
         if not file_path.startswith("project_root/"):
-            logging.error(
+            logger.error(
                 "Unexpected response from AI model. Auto context: requested filepath not recognised. Please check the conversation history under ai_engineer_output"
             )
 
@@ -0,0 +1,253 @@
+"""
+The DependencyGraph class builds the import graph of a project's Python files
+and orders them so that every module is edited before the modules importing it.
+"""
+
+import ast
+import logging
+import os
+
+logger = logging.getLogger(__name__)
+
+
+class DependencyGraph:
+    """
+    Import graph between the Python files of a project.
+
+    Attributes:
+        project_root (str): Path of the project on disk.
+        file_path_masks (list): File paths starting with project_root/.
+        dependencies (dict): Maps each file to the project files it imports.
+    """
+
+    def __init__(self, project_root, file_path_masks):
+        self.project_root = project_root
+        self.file_path_masks = list(file_path_masks)
+        self.modules = {}
+        for file_path_mask in self.file_path_masks:
+            for module_name in self.ai_engineer_module_names(file_path_mask):
+                self.modules.setdefault(module_name, []).append(file_path_mask)
+        self.dependencies = {
+            file_path_mask: self.ai_engineer_resolve_dependencies(file_path_mask)
+            for file_path_mask in self.file_path_masks
+        }
+
+    @staticmethod
+    def ai_engineer_module_parts(file_path_mask):
+        """
+        Split a Python file path into its dotted module parts.
+
+        Args:
+            file_path_mask (str): File path starting with project_root/.
+
+        Returns:
+            list: Module parts, e.g. ["src", "pkg", "mod"], or [] for non-Python files.
+        """
+        if not file_path_mask.endswith(".py"):
+            return []
+        parts = file_path_mask[: -len(".py")].split("/")[1:]
+        if parts and parts[-1] == "__init__":
+            parts = parts[:-1]
+        return parts
+
+    def ai_engineer_module_names(self, file_path_mask):
+        """
+        List every dotted name the file may be imported as.
+
+        The project layout (src/, nested packages, scripts) is unknown, so every
+        suffix of the module path is registered.
+        """
+        parts = self.ai_engineer_module_parts(file_path_mask)
+        return [".".join(parts[i:]) for i in range(len(parts))]
+
+    def ai_engineer_read_imports(self, file_path_mask):
+        """
+        Collect the absolute dotted names imported by a Python file.
+
+        Relative imports are resolved against the file's package. For
+        `from x import y` both `x.y` and `x` are returned, as y may be a module.
+
+        Returns:
+            set: Imported dotted names.
+        """
+        file_path = file_path_mask.replace("project_root", self.project_root, 1)
+        try:
+            with open(file_path, "r", encoding="utf-8") as f:
+                tree = ast.parse(f.read(), filename=file_path)
+        except (SyntaxError, UnicodeDecodeError, ValueError) as e:
+            logger.warning("Could not parse imports of %s: %s", file_path, e)
+            return set()
+
+        package = self.ai_engineer_module_parts(file_path_mask)
+        if not file_path_mask.endswith("/__init__.py"):
+            package = package[:-1]
+
+        imports = set()
+        for node in ast.walk(tree):
+            if isinstance(node, ast.Import):
+                imports.update(alias.name for alias in node.names)
+            elif isinstance(node, ast.ImportFrom):
+                if node.level:
+                    base = package[: len(package) - node.level + 1]
+                    module = ".".join(base + ([node.module] if node.module else []))
+                else:
+                    module = node.module or ""
+                if module:
+                    imports.add(module)
+                imports.update(
+                    f"{module}.{alias.name}" if module else alias.name
+                    for alias in node.names
+                )
+        return imports
+
+    def ai_engineer_resolve_dependencies(self, file_path_mask):
+        """
+        Resolve the imports of a file to project files.
+
+        When several files match an import, the one sharing the longest path
+        prefix with the importing file wins.
+
+        Returns:
+            set: Project files imported by the file.
+        """
+        if not file_path_mask.endswith(".py"):
+            return set()
+        dependencies = set()
+        for module_name in self.ai_engineer_read_imports(file_path_mask):
+            candidates = self.modules.get(module_name)
+            if not candidates:
+                continue
+            dependency = max(
+                candidates,
+                key=lambda c: len(os.path.commonprefix([c, file_path_mask])),
+            )
+            if dependency != file_path_mask:
+                dependencies.add(dependency)
+        return dependencies
+
+    def ai_engineer_levels(self):
+        """
+        Group the files into levels in topological order of their imports.
+
+        Files of a level only import files of earlier levels and can be edited in
+        parallel. Import cycles are kept together in a single level.
+
+        Returns:
+            list: Lists of file paths, callees before callers.
+        """
+        components = self.ai_engineer_strongly_connected_components()
+        component_of = {
+            file_path_mask: index
+            for index, component in enumerate(components)
+            for file_path_mask in component
+        }
+        component_levels = []
+        # Tarjan's algorithm emits components after everything they depend on
+        for index, component in enumerate(components):
+            level = 0
+            for file_path_mask in component:
+                for dependency in self.dependencies[file_path_mask]:
+                    if component_of[dependency] != index:
+                        level = max(
+                            level, component_levels[component_of[dependency]] + 1
+                        )
+            component_levels.append(level)
+
+        levels = [[] for _ in range(max(component_levels, default=-1) + 1)]
+        for component, level in zip(components, component_levels):
+            levels[level].extend(component)
+        logger.info(
+            "Scheduled %d files in %d dependency levels.",
+            len(self.file_path_masks),
+            len(levels),
+        )
+        return levels
+
+    def ai_engineer_strongly_connected_components(self):
+        """
+        Find the import cycles of the graph with an iterative Tarjan's algorithm.
+
+        Returns:
+            list: Components as lists of file paths, dependencies first.
+        """
+        index = {}
+        lowlink = {}
+        stack = []
+        on_stack = set()
+        components = []
+
+        for root in self.file_path_masks:
+            if root in index:
+                continue
+            work = [(root, iter(sorted(self.dependencies[root])))]
+            index[root] = lowlink[root] = len(index)
+            stack.append(root)
+            on_stack.add(root)
+            while work:
+                node, children = work[-1]
+                child = next(children, None)
+                if child is not None:
+                    if child not in index:
+                        index[child] = lowlink[child] = len(index)
+                        stack.append(child)
+                        on_stack.add(child)
+                        work.append((child, iter(sorted(self.dependencies[child]))))
+                    elif child in on_stack:
+                        lowlink[node] = min(lowlink[node], index[child])
+                    continue
+                work.pop()
+                if work:
+                    parent = work[-1][0]
+                    lowlink[parent] = min(lowlink[parent], lowlink[node])
+                if lowlink[node] == index[node]:
+                    component = []
+                    while True:
+                        member = stack.pop()
+                        on_stack.discard(member)
+                        component.append(member)
+                        if member == node:
+                            break
+                    components.append(component)
+        return components
+
+    @staticmethod
+    def ai_engineer_public_signatures(source):
+        """
+        Summarise the public API of a Python module as compact signatures.
+
+        Args:
+            source (str): Python source code.
+
+        Returns:
+            str: One line per public function, class and method, or "" if the
+            source does not parse.
+        """
+        try:
+            tree = ast.parse(source)
+        except (SyntaxError, ValueError):
+            return ""
+
+        def signature(node, indent=""):
+            prefix = "async def" if isinstance(node, ast.AsyncFunctionDef) else "def"
+            returns = f" -> {ast.unparse(node.returns)}" if node.returns else ""
+            return f"{indent}{prefix} {node.name}({ast.unparse(node.args)}){returns}"
+
+        lines = []
+        for node in tree.body:
+            if not isinstance(
+                node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)
+            ) or node.name.startswith("_"):
+                continue
+            if isinstance(node, ast.ClassDef):
+                bases = ", ".join(ast.unparse(base) for base in node.bases)
+                lines.append(
+                    f"class {node.name}({bases}):" if bases else f"class {node.name}:"
+                )
+                for child in node.body:
+                    if isinstance(child, (ast.FunctionDef, ast.AsyncFunctionDef)) and (
+                        not child.name.startswith("_") or child.name == "__init__"
+                    ):
+                        lines.append(signature(child, "    "))
+            else:
+                lines.append(signature(node))
+        return "\n".join(lines)
@@ -0,0 +1,73 @@
+"""
+Logging setup for applications running AIEngineer, such as the CLI.
+
+The library itself only attaches a NullHandler to the `ai_engineer` logger and
+leaves the host application's root logger alone. configure_logging routes the
+package's records through a queue to a background thread, so that formatting
+and file writes stay off the hot paths.
+"""
+
+import atexit
+import logging
+import logging.handlers
+import queue
+
+STANDARD_FORMAT = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+DETAILED_FORMAT = (
+    "%(asctime)s - %(name)s - %(levelname)s - %(filename)s:%(lineno)d - %(message)s"
+)
+
+_listener = None
+
+
+def configure_logging(level=logging.INFO, log_file="app.log"):
+    """
+    Log the `ai_engineer` package to the console and a file via a background writer.
+
+    Calling it again replaces the previous configuration.
+
+    Args:
+        level (int, optional): Level of the `ai_engineer` logger.
+        log_file (str, optional): Path of the log file, or None to only log to the console.
+
+    Returns:
+        logging.handlers.QueueListener: The running background writer.
+    """
+    global _listener  # pylint: disable=global-statement
+    stop_logging()
+
+    console_handler = logging.StreamHandler()
+    console_handler.setFormatter(logging.Formatter(STANDARD_FORMAT))
+    handlers = [console_handler]
+    if log_file:
+        file_handler = logging.FileHandler(log_file, mode="a", encoding="utf-8")
+        file_handler.setFormatter(logging.Formatter(DETAILED_FORMAT))
+        handlers.append(file_handler)
+
+    log_queue = queue.SimpleQueue()
+    package_logger = logging.getLogger("ai_engineer")
+    for handler in list(package_logger.handlers):
+        if isinstance(handler, logging.handlers.QueueHandler):
+            package_logger.removeHandler(handler)
+    package_logger.addHandler(logging.handlers.QueueHandler(log_queue))
+    package_logger.setLevel(level)
+    package_logger.propagate = False
+
+    _listener = logging.handlers.QueueListener(
+        log_queue, *handlers, respect_handler_level=True
+    )
+    _listener.start()
+    return _listener
+
+
+def stop_logging():
+    """Flush the queued records and stop the background writer."""
+    global _listener  # pylint: disable=global-statement
+    if _listener is not None:
+        _listener.stop()
+        for handler in _listener.handlers:
+            handler.close()
+        _listener = None
+
+
+atexit.register(stop_logging)
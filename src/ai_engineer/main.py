@@ -8,19 +8,21 @@ from typing import Optional
 import typer
 from dotenv import load_dotenv
 
+from .logging_config import configure_logging
+from .profiling import Profiler
+from .services.openai_batch import OpenAIBatch
 from .services.openai_engineer import OpenAIEngineer
+from .services.openai_planner import OpenAIPlanner
+from .tracing import tracer
 
 app = typer.Typer()
 
-# Set up logging configuration
-logging.basicConfig(
-    level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s"
-)
-logger = logging.getLogger(__name__)
+logger = logging.getLogger("ai_engineer.main")
 
 
 def cli():
     """Entry point for the CLI."""
+    configure_logging()
     app()
 
 
@@ -82,11 +84,83 @@ def main(
         "--max_chat_iterations",
         help="Max chat iterations for the AI model.",
     ),
+    plan: bool = typer.Option(
+        False,
+        "--plan",
+        help="Estimate tokens, cost and wall-clock time without calling the AI model.",
+    ),
+    plan_tiktoken: bool = typer.Option(
+        False,
+        "--plan_tiktoken",
+        help="Count --plan tokens exactly with tiktoken, which downloads the encoding on first use.",
+    ),
+    concurrency: int = typer.Option(
+        1, "--concurrency", help="Number of editor requests in flight at once."
+    ),
+    requests_per_minute: int = typer.Option(
+        500,
+        "--requests_per_minute",
+        help="Request rate limit of the API key, 0 for none.",
+    ),
+    tokens_per_minute: int = typer.Option(
+        200000,
+        "--tokens_per_minute",
+        help="Token rate limit of the API key, 0 for none.",
+    ),
+    max_validation_retries: int = typer.Option(
+        2,
+        "--max_validation_retries",
+        help="Times a generated file failing validation is requested again.",
+    ),
+    dedup_identical_files: bool = typer.Option(
+        False,
+        "--dedup_identical_files",
+        help="Editor mode: request byte-identical files once and copy the edit to the others.",
+    ),
+    fsync: str = typer.Option(
+        "never",
+        "--fsync",
+        help="Fsync policy of written files: never, always or end.",
+    ),
+    stage_outputs: bool = typer.Option(
+        False,
+        "--stage_outputs",
+        help="Stage every output and apply them together at the end of the run.",
+    ),
+    trace: Optional[str] = typer.Option(
+        None,
+        "--trace",
+        help="Write a Chrome trace-event JSON of the run phases to this path.",
+    ),
+    profile: bool = typer.Option(
+        False,
+        "--profile",
+        help="Profile the run, worker threads included, with cProfile and save the stats under ai_engineer_output.",
+    ),
 ):
     """
     Run AI co-creator tasks with OpenAI.
     """
     try:
+        if plan:
+            planner = OpenAIPlanner(
+                concurrency=concurrency,
+                requests_per_minute=requests_per_minute,
+                tokens_per_minute=tokens_per_minute,
+                use_tiktoken=plan_tiktoken,
+            )
+            project_plan = planner.ai_engineer_project_tree_plan(
+                project_path=project_path,
+                prompt=prompt,
+                mode=mode,
+                auto_file_discovery=auto_file_discovery,
+                reuse_auto_file_discovery=reuse_auto_file_discovery,
+                gitignore_file_path=gitignore_file_path,
+                max_chat_iterations=max_chat_iterations,
+            )
+            typer.echo(planner.ai_engineer_format_plan(project_plan))
+            return
+
         # Load API key
         openai_api_key = load_api_key(api_key)
 
@@ -96,17 +170,37 @@ def main(
         # Log the start of processing
         logger.info("Starting processing with project_path: %s", project_path)
 
-        # Run the project tree prompt processing
-        engineer.ai_engineer_project_tree_prompt(
-            project_path=project_path,
-            prompt=prompt,
-            mode=mode,
-            auto_file_discovery=auto_file_discovery,
-            reuse_auto_file_discovery=reuse_auto_file_discovery,
-            gitignore_file_path=gitignore_file_path,
-            overwrite=overwrite,
-            max_chat_iterations=max_chat_iterations,
-        )
+        profiler = Profiler() if profile else None
+        if trace:
+            tracer.enable()
+        if profiler is not None:
+            profiler.enable()
+
+        try:
+            # Run the project tree prompt processing
+            with tracer.span("project_tree_prompt", "run", mode=mode):
+                engineer.ai_engineer_project_tree_prompt(
+                    project_path=project_path,
+                    prompt=prompt,
+                    mode=mode,
+                    auto_file_discovery=auto_file_discovery,
+                    reuse_auto_file_discovery=reuse_auto_file_discovery,
+                    gitignore_file_path=gitignore_file_path,
+                    overwrite=overwrite,
+                    max_chat_iterations=max_chat_iterations,
+                    concurrency=concurrency,
+                    max_validation_retries=max_validation_retries,
+                    dedup_identical_files=dedup_identical_files,
+                    fsync=fsync,
+                    stage_outputs=stage_outputs,
+                )
+        finally:
+            if profiler is not None:
+                profiler.disable()
+                engineer.ai_engineer_export_profile(profiler)
+            if trace:
+                tracer.disable()
+                tracer.export(trace)
 
         # Log successful completion
         logger.info("Processing completed successfully.")
@@ -117,5 +211,110 @@ def main(
         raise typer.Exit(code=1)
 
 
+@app.command()
+def batch(
+    manifest_path: str = typer.Argument(
+        ..., help="Path to a JSON manifest of project paths and prompts."
+    ),
+    mode: str = typer.Option(
+        "editor", "--mode", help="System mode for projects that do not set one."
+    ),
+    api_key: Optional[str] = typer.Option(
+        None, "--api_key", help="Your OpenAI API key."
+    ),
+    gitignore_file_path: str = typer.Option(
+        ".gitignore",
+        "--gitignore_file_path",
+        help="Relative path of .gitignore.",
+    ),
+    overwrite: bool = typer.Option(
+        False, "--overwrite", help="Overwrite existing files."
+    ),
+    max_chat_iterations: int = typer.Option(
+        25,
+        "--max_chat_iterations",
+        help="Max chat iterations for the AI model.",
+    ),
+    concurrency: int = typer.Option(
+        4, "--concurrency", help="Editor requests in flight at once per project."
+    ),
+    max_validation_retries: int = typer.Option(
+        2,
+        "--max_validation_retries",
+        help="Times a generated file failing validation is requested again.",
+    ),
+    dedup_identical_files: bool = typer.Option(
+        False,
+        "--dedup_identical_files",
+        help="Editor mode: request byte-identical files once and copy the edit to the others.",
+    ),
+    fsync: str = typer.Option(
+        "never",
+        "--fsync",
+        help="Fsync policy of written files: never, always or end.",
+    ),
+    stage_outputs: bool = typer.Option(
+        False,
+        "--stage_outputs",
+        help="Stage every output and apply them together at the end of the run.",
+    ),
+    parallel_projects: int = typer.Option(
+        4, "--parallel_projects", help="Number of projects processed at once."
+    ),
+    max_concurrency: int = typer.Option(
+        16,
+        "--max_concurrency",
+        help="Requests in flight at once across all projects, also the connection pool size.",
+    ),
+    requests_per_minute: int = typer.Option(
+        500,
+        "--requests_per_minute",
+        help="Request rate limit across all projects, 0 for no pacing.",
+    ),
+    report_path: Optional[str] = typer.Option(
+        None,
+        "--report_path",
+        help="Path of the JSON batch report. Defaults to ai_engineer_output/.",
+    ),
+):
+    """
+    Run AI co-creator tasks with OpenAI over many projects in one process.
+    """
+    try:
+        projects = OpenAIBatch.ai_engineer_read_manifest(
+            manifest_path,
+            defaults={
+                "mode": mode,
+                "gitignore_file_path": gitignore_file_path,
+                "overwrite": overwrite,
+                "max_chat_iterations": max_chat_iterations,
+                "concurrency": concurrency,
+                "max_validation_retries": max_validation_retries,
+                "dedup_identical_files": dedup_identical_files,
+                "fsync": fsync,
+                "stage_outputs": stage_outputs,
+            },
+        )
+        batch_runner = OpenAIBatch(
+            api_key=load_api_key(api_key),
+            max_concurrency=max_concurrency,
+            requests_per_minute=requests_per_minute,
+        )
+        try:
+            report = batch_runner.ai_engineer_run(projects, parallel_projects)
+        finally:
+            batch_runner.close()
+        batch_runner.ai_engineer_export_report(report, report_path)
+        typer.echo(batch_runner.ai_engineer_format_report(report))
+
+    except Exception as e:
+        logger.error("An error occurred during batch processing: %s", e)
+        traceback.print_exc()
+        raise typer.Exit(code=1)
+
+    if report["totals"]["failed"]:
+        raise typer.Exit(code=1)
+
+
 if __name__ == "__main__":
     cli()
@@ -0,0 +1,251 @@
+"""
+The OutputWriter class writes generated files on a background thread, replacing
+each file atomically so that a crash never leaves a half-written file behind.
+"""
+
+import logging
+import os
+import queue
+import secrets
+import threading
+
+from .tracing import tracer
+
+logger = logging.getLogger(__name__)
+
+UTF8_BOM = b"\xef\xbb\xbf"
+
+
+class OutputWriter:
+    """
+    Write-behind pipeline for generated files.
+
+    Files are written to a temporary file in the target directory, then renamed
+    over the target. The mode and UTF-8 byte order mark of the source file are
+    kept, which is the target itself unless another source is given. New files
+    get the default mode for the current umask.
+
+    With staging enabled, files are only written to their temporary files
+    during the run, and close() renames them all in one commit step at the end.
+    abort() discards them, leaving the project untouched.
+
+    Attributes:
+        fsync (str): "never", "always" to fsync every file and its directory,
+            or "end" to fsync every written file when the writer closes.
+        staged (bool): Whether outputs are applied in one commit step on close.
+        batch_size (int): Maximum files written per batch by the worker.
+    """
+
+    FSYNC_POLICIES = ("never", "always", "end")
+
+    def __init__(self, fsync="never", staged=False, batch_size=32):
+        if fsync not in self.FSYNC_POLICIES:
+            raise ValueError(
+                f"Unknown fsync policy {fsync!r}, "
+                f"expected one of {', '.join(self.FSYNC_POLICIES)}."
+            )
+        self.fsync = fsync
+        self.staged = staged
+        self.batch_size = batch_size
+        self.staged_files = {}
+        self.written_files = []
+        self.errors = []
+        self.queue = queue.Queue()
+        self.worker = threading.Thread(
+            target=self.ai_engineer_run_worker,
+            name="ai_engineer_output_writer",
+            daemon=True,
+        )
+        self.worker.start()
+
+    def submit(self, file_path, file_content, source_path=None):
+        """
+        Queue a file to be written. A later submit for the same path wins.
+
+        Args:
+            file_path (str): Path of the file on disk.
+            file_content (str): Content of the file.
+            source_path (str, optional): File whose mode and byte order mark are
+                kept, such as the original of a .ai_engineer copy. Defaults to
+                file_path.
+        """
+        self.queue.put((file_path, file_content, source_path or file_path))
+
+    def close(self):
+        """
+        Write every queued file, apply the staged files and stop the worker.
+
+        Raises:
+            Exception: The first error of the worker, if any. Staged files are
+                discarded in that case.
+        """
+        self.queue.join()
+        self.queue.put(None)
+        self.worker.join()
+        if self.errors:
+            self.ai_engineer_discard_staged()
+            raise self.errors[0]
+        if self.staged:
+            self.ai_engineer_commit_staged()
+        if self.fsync == "end":
+            for file_path in self.written_files:
+                self.ai_engineer_fsync_path(file_path)
+        if self.fsync == "end" or (self.fsync == "always" and self.staged):
+            for directory in {os.path.dirname(f) or "." for f in self.written_files}:
+                self.ai_engineer_fsync_path(directory)
+
+    def abort(self):
+        """Stop the worker and discard the staged files without applying them."""
+        self.queue.join()
+        self.queue.put(None)
+        self.worker.join()
+        self.ai_engineer_discard_staged()
+
+    def ai_engineer_run_worker(self):
+        """Write queued files in batches until stopped."""
+        while True:
+            item = self.queue.get()
+            if item is None:
+                self.queue.task_done()
+                return
+            batch = [item]
+            while len(batch) < self.batch_size:
+                try:
+                    item = self.queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is None:
+                    # Handle the stop request after this batch
+                    self.queue.task_done()
+                    self.queue.put(None)
+                    break
+                batch.append(item)
+
+            try:
+                self.ai_engineer_write_batch(batch)
+            finally:
+                # Never leave close() or abort() waiting on a failed batch
+                for _ in batch:
+                    self.queue.task_done()
+
+    def ai_engineer_write_batch(self, batch):
+        """
+        Write a batch of queued files, recording errors instead of raising them.
+
+        Args:
+            batch (list): (file_path, file_content, source_path) tuples.
+        """
+        with tracer.span("write_batch", "write", files=len(batch)):
+            for file_path, file_content, source_path in batch:
+                try:
+                    self.ai_engineer_write_atomic(file_path, file_content, source_path)
+                except Exception as e:  # pylint: disable=broad-except
+                    logger.error("Could not write file %s: %s", file_path, e)
+                    self.errors.append(e)
+            if self.fsync == "always" and not self.staged:
+                # One directory fsync per batch makes the renames durable
+                for directory in {os.path.dirname(f) or "." for f, _, _ in batch}:
+                    try:
+                        self.ai_engineer_fsync_path(directory)
+                    except OSError as e:
+                        logger.error("Could not fsync directory %s: %s", directory, e)
+                        self.errors.append(e)
+
+    def ai_engineer_write_atomic(self, file_path, file_content, source_path=None):
+        """
+        Write a file to a temporary file and rename it over the target.
+
+        When staging, the temporary file is kept until commit instead.
+
+        Args:
+            file_path (str): Path of the file on disk.
+            file_content (str): Content of the file.
+            source_path (str, optional): File whose mode and byte order mark are
+                kept. Defaults to file_path.
+        """
+        directory = os.path.dirname(file_path) or "."
+        os.makedirs(directory, exist_ok=True)
+
+        mode = None
+        encoding = "utf-8"
+        try:
+            mode = os.stat(source_path or file_path).st_mode & 0o7777
+            with open(source_path or file_path, "rb") as f:
+                if f.read(len(UTF8_BOM)) == UTF8_BOM:
+                    # Keep the byte order mark unless the content already has it
+                    if not file_content.startswith("\ufeff"):
+                        encoding = "utf-8-sig"
+        except FileNotFoundError:
+            pass
+
+        fd, temp_path = self.ai_engineer_create_temp(file_path)
+        try:
+            with os.fdopen(fd, "w", encoding=encoding) as f:
+                f.write(file_content)
+                if self.fsync == "always":
+                    f.flush()
+                    os.fsync(f.fileno())
+            if mode is not None:
+                os.chmod(temp_path, mode)
+            if self.staged:
+                previous_temp_path = self.staged_files.pop(file_path, None)
+                if previous_temp_path is not None:
+                    os.remove(previous_temp_path)
+                self.staged_files[file_path] = temp_path
+            else:
+                os.replace(temp_path, file_path)
+                self.written_files.append(file_path)
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+
+    def ai_engineer_commit_staged(self):
+        """Rename every staged file over its target."""
+        with tracer.span("commit_outputs", "write", files=len(self.staged_files)):
+            for file_path, temp_path in self.staged_files.items():
+                os.replace(temp_path, file_path)
+                self.written_files.append(file_path)
+        logger.info("Committed %d staged output files.", len(self.staged_files))
+        self.staged_files = {}
+
+    def ai_engineer_discard_staged(self):
+        """Remove every staged file without applying it."""
+        for temp_path in self.staged_files.values():
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+        if self.staged_files:
+            logger.warning("Discarded %d staged output files.", len(self.staged_files))
+        self.staged_files = {}
+
+    @staticmethod
+    def ai_engineer_create_temp(file_path):
+        """
+        Create a temporary file next to a target.
+
+        The file is created with mode 0o666 for the OS to apply the umask, so
+        that new targets get the same mode as files created by open().
+
+        Returns:
+            tuple: The file descriptor and path of the temporary file.
+        """
+        directory = os.path.dirname(file_path) or "."
+        while True:
+            temp_path = os.path.join(
+                directory,
+                f".{os.path.basename(file_path)}.{secrets.token_hex(4)}.tmp",
+            )
+            try:
+                fd = os.open(temp_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o666)
+            except FileExistsError:
+                continue
+            return fd, temp_path
+
+    @staticmethod
+    def ai_engineer_fsync_path(path):
+        """Flush a file or directory to disk."""
+        fd = os.open(path, os.O_RDONLY)
+        try:
+            os.fsync(fd)
+        finally:
+            os.close(fd)
@@ -0,0 +1,60 @@
+"""
+cProfile session covering the worker threads of a run, not only the main thread.
+"""
+
+import cProfile
+import pstats
+import sys
+import threading
+
+
+class Profiler:
+    """
+    Profile the calling thread and every thread started while enabled.
+
+    Before Python 3.12 a cProfile.Profile only records the thread that enabled
+    it, so each new thread gets its own profile, merged on export. From 3.12 on
+    cProfile records every thread through sys.monitoring, which allows only one
+    active profile, so a single profile is used. Its call counts cover every
+    thread, but calls running at the same time in several threads can skew its
+    cumulative times.
+
+    Attributes:
+        profiles (list): The profiles of the session, the main thread's first.
+    """
+
+    PER_THREAD = sys.version_info < (3, 12)
+
+    def __init__(self):
+        self.profiles = [cProfile.Profile()]
+        self.lock = threading.Lock()
+
+    def enable(self):
+        """Start profiling the calling thread and the threads it starts."""
+        if self.PER_THREAD:
+            threading.setprofile(self.ai_engineer_profile_thread)
+        self.profiles[0].enable()
+
+    def disable(self):
+        """Stop profiling the calling thread and stop following new threads."""
+        self.profiles[0].disable()
+        if self.PER_THREAD:
+            threading.setprofile(None)
+
+    def ai_engineer_profile_thread(self, *_):
+        """Profile hook of new threads, replaced by their own profile on first call."""
+        profile = cProfile.Profile()
+        with self.lock:
+            self.profiles.append(profile)
+        profile.enable()
+
+    def dump_stats(self, file_path):
+        """
+        Save the merged statistics of every profiled thread.
+
+        Args:
+            file_path (str): Path of the .prof file.
+        """
+        with self.lock:
+            profiles = list(self.profiles)
+        pstats.Stats(*profiles).dump_stats(file_path)
@@ -0,0 +1,147 @@
+"""
+The ProjectTree class is a compact, array-backed model of a project's directory
+structure with a token-efficient text encoding for prompts.
+"""
+
+import sys
+from array import array
+
+
+class ProjectTree:
+    """
+    Directory tree stored as parallel arrays of nodes.
+
+    Node 0 is project_root. Every node is added after its parent, so a single
+    pass in index order visits parents before children. Path segments are
+    interned, so repeated names such as __init__.py are stored once.
+
+    Attributes:
+        names (list): Interned name of each node.
+        parents (array): Parent index of each node, -1 for the root.
+        is_file (bytearray): 1 for files, 0 for directories.
+        files (array): Indices of the file nodes, in insertion order.
+        digests (list): Content digest of each file in files, or None if not hashed.
+    """
+
+    ROOT = "project_root"
+
+    def __init__(self):
+        self.names = [self.ROOT]
+        self.parents = array("i", [-1])
+        self.is_file = bytearray([0])
+        self.files = array("i")
+        self.digests = []
+
+    def __len__(self):
+        return len(self.names)
+
+    def ai_engineer_add_node(self, parent, name, is_file=False, digest=None):
+        """
+        Add a file or directory under a directory node.
+
+        Args:
+            parent (int): Index of the parent directory.
+            name (str): Name of the file or directory.
+            is_file (bool, optional): Whether the node is a file.
+            digest (bytes, optional): Content digest of the file.
+
+        Returns:
+            int: Index of the new node.
+        """
+        index = len(self.names)
+        self.names.append(sys.intern(name))
+        self.parents.append(parent)
+        self.is_file.append(1 if is_file else 0)
+        if is_file:
+            self.files.append(index)
+            self.digests.append(digest)
+        return index
+
+    def ai_engineer_node_paths(self, directories_only=False):
+        """
+        Compute the path of every node, starting with project_root.
+
+        Args:
+            directories_only (bool, optional): Leave file paths as None.
+
+        Returns:
+            list: Path of each node by index.
+        """
+        paths = [self.ROOT] + [None] * (len(self.names) - 1)
+        for index in range(1, len(self.names)):
+            if directories_only and self.is_file[index]:
+                continue
+            paths[index] = f"{paths[self.parents[index]]}/{self.names[index]}"
+        return paths
+
+    def ai_engineer_file_paths(self):
+        """
+        Iterate over the paths of every file, e.g. project_root/src/main.py.
+
+        Yields:
+            str: File path starting with project_root/.
+        """
+        directory_paths = self.ai_engineer_node_paths(directories_only=True)
+        for index in self.files:
+            yield f"{directory_paths[self.parents[index]]}/{self.names[index]}"
+
+    def ai_engineer_file_digests(self):
+        """
+        Map the path of every hashed file to its content digest.
+
+        Returns:
+            dict: File paths starting with project_root/ to digests.
+        """
+        return {
+            file_path: digest
+            for file_path, digest in zip(self.ai_engineer_file_paths(), self.digests)
+            if digest is not None
+        }
+
+    def ai_engineer_children(self):
+        """
+        List the children of every node, sorted by name.
+
+        Returns:
+            list: Child indices of each node by index.
+        """
+        children = [[] for _ in self.names]
+        for index in range(1, len(self.names)):
+            children[self.parents[index]].append(index)
+        for node_children in children:
+            node_children.sort(key=self.names.__getitem__)
+        return children
+
+    def ai_engineer_to_dict(self):
+        """
+        Convert the tree to the nested dictionary format of ai_engineer_build_dir_structure.
+
+        Returns:
+            dict: {"project_root": {...}} with None for files and dicts for directories.
+        """
+        nodes = [{}] + [None] * (len(self.names) - 1)
+        for index in range(1, len(self.names)):
+            node = None if self.is_file[index] else {}
+            nodes[index] = node
+            nodes[self.parents[index]][self.names[index]] = node
+        return {self.ROOT: nodes[0]}
+
+    def ai_engineer_encode(self):
+        """
+        Encode the tree as indented text, one node per line.
+
+        Each level is indented by one more space and directories end with "/".
+        This costs far fewer tokens than the JSON of the nested dictionary.
+
+        Returns:
+            str: The encoded tree.
+        """
+        children = self.ai_engineer_children()
+        lines = []
+        stack = [(0, 0)]
+        while stack:
+            index, depth = stack.pop()
+            suffix = "" if self.is_file[index] else "/"
+            lines.append(f"{' ' * depth}{self.names[index]}{suffix}")
+            stack.extend((child, depth + 1) for child in reversed(children[index]))
+        return "\n".join(lines)
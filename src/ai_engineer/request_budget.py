@@ -0,0 +1,47 @@
+"""
+The RequestBudget class caps the AI model requests in flight and paces them to a
+rate limit, across every engineer and thread sharing it.
+"""
+
+import threading
+import time
+
+
+class RequestBudget:
+    """
+    Context manager admitting one request at a time into a shared budget.
+
+    Attributes:
+        max_concurrency (int): Maximum number of requests in flight.
+        requests_per_minute (int): Maximum request rate, 0 for no pacing.
+    """
+
+    def __init__(self, max_concurrency=16, requests_per_minute=500):
+        if max_concurrency < 1:
+            raise ValueError(
+                f"max_concurrency must be at least 1, got {max_concurrency}."
+            )
+        if requests_per_minute < 0:
+            raise ValueError(
+                f"requests_per_minute must not be negative, got {requests_per_minute}."
+            )
+        self.max_concurrency = max_concurrency
+        self.requests_per_minute = requests_per_minute
+        self.semaphore = threading.BoundedSemaphore(max_concurrency)
+        self.interval = 60.0 / requests_per_minute if requests_per_minute else 0.0
+        self.lock = threading.Lock()
+        self.next_request_time = time.monotonic()
+
+    def __enter__(self):
+        self.semaphore.acquire()
+        with self.lock:
+            now = time.monotonic()
+            start = max(now, self.next_request_time)
+            self.next_request_time = start + self.interval
+        if start > now:
+            time.sleep(start - now)
+        return self
+
+    def __exit__(self, *exc_info):
+        self.semaphore.release()
+        return False
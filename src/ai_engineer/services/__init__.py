@@ -1,5 +1,7 @@
 """Services module for AIEngineer package."""
 
+from .openai_batch import OpenAIBatch
 from .openai_engineer import OpenAIEngineer
+from .openai_planner import OpenAIPlanner
 
-__all__ = ["OpenAIEngineer"]
+__all__ = ["OpenAIBatch", "OpenAIEngineer", "OpenAIPlanner"]
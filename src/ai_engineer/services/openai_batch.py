@@ -0,0 +1,237 @@
+"""
+The OpenAIBatch class runs OpenAIEngineer over many projects in one process,
+sharing a single pooled HTTP client and a global request budget.
+"""
+
+import importlib.util
+import json
+import logging
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+import httpx
+from openai import DefaultHttpxClient
+
+from ..request_budget import RequestBudget
+from .openai_engineer import OpenAIEngineer
+from .openai_planner import OpenAIPlanner
+
+logger = logging.getLogger(__name__)
+
+
+class OpenAIBatch:
+    """
+    Batch runner for OpenAIEngineer.
+
+    Attributes:
+        api_key (str): OpenAI API key shared by every project.
+        http_client (httpx.Client): Connection pool shared by every project,
+            using HTTP/2 when the h2 package is installed.
+        request_budget (RequestBudget): Concurrency and rate budget shared by
+            every project.
+    """
+
+    PROJECT_OPTIONS = (
+        "mode",
+        "auto_file_discovery",
+        "reuse_auto_file_discovery",
+        "gitignore_file_path",
+        "overwrite",
+        "max_chat_iterations",
+        "concurrency",
+        "max_validation_retries",
+        "dedup_identical_files",
+        "fsync",
+        "stage_outputs",
+    )
+
+    def __init__(self, api_key, max_concurrency=16, requests_per_minute=500):
+        self.init_time = datetime.now()
+        self.api_key = api_key
+        http2 = importlib.util.find_spec("h2") is not None
+        if not http2:
+            logger.info(
+                "h2 is not installed, the shared HTTP client uses HTTP/1.1. "
+                "Install the http2 extra to use HTTP/2."
+            )
+        self.http_client = DefaultHttpxClient(
+            http2=http2,
+            limits=httpx.Limits(
+                max_connections=max_concurrency,
+                max_keepalive_connections=max_concurrency,
+                keepalive_expiry=60,
+            ),
+        )
+        self.request_budget = RequestBudget(max_concurrency, requests_per_minute)
+
+    @staticmethod
+    def ai_engineer_read_manifest(manifest_path, defaults=None):
+        """
+        Read the projects of a batch from a JSON manifest.
+
+        The manifest is either a list of projects or an object with a "projects"
+        list and optional "defaults". A project is a path or an object with
+        "project_path", "prompt" and any ai_engineer_project_tree_prompt option.
+
+        Args:
+            manifest_path (str): Path to the manifest.
+            defaults (dict, optional): Options for projects that do not set them,
+                overridden by the manifest defaults.
+
+        Returns:
+            list: The projects, with every option resolved.
+
+        Raises:
+            ValueError: If a project has no project_path, prompt or mode.
+        """
+        with open(manifest_path, "r", encoding="utf-8") as f:
+            manifest = json.load(f)
+        if isinstance(manifest, list):
+            manifest = {"projects": manifest}
+        defaults = {**(defaults or {}), **manifest.get("defaults", {})}
+
+        projects = []
+        for entry in manifest["projects"]:
+            if isinstance(entry, str):
+                entry = {"project_path": entry}
+            project = {**defaults, **entry}
+            for key in ("project_path", "prompt", "mode"):
+                if not project.get(key):
+                    raise ValueError(f"Batch project {entry} has no {key}.")
+            projects.append(project)
+        logger.info("Read %d projects from manifest: %s", len(projects), manifest_path)
+        return projects
+
+    def ai_engineer_run_project(self, project):
+        """
+        Run a single project of the batch with its own OpenAIEngineer.
+
+        Failures are recorded in the result instead of stopping the batch.
+
+        Args:
+            project (dict): A project from ai_engineer_read_manifest.
+
+        Returns:
+            dict: The project's result and metrics.
+        """
+        engineer = OpenAIEngineer(
+            api_key=self.api_key,
+            http_client=self.http_client,
+            request_budget=self.request_budget,
+        )
+        result = {"project_path": project["project_path"], "mode": project["mode"]}
+        start = time.perf_counter()
+        try:
+            if not os.path.isdir(project["project_path"]):
+                raise FileNotFoundError(
+                    f"Project directory not found: {project['project_path']}"
+                )
+            engineer.ai_engineer_project_tree_prompt(
+                project_path=project["project_path"],
+                prompt=project["prompt"],
+                **{
+                    option: project[option]
+                    for option in self.PROJECT_OPTIONS
+                    if option in project
+                },
+            )
+            result["status"] = "succeeded"
+        except Exception as e:  # pylint: disable=broad-except
+            logger.error(
+                "Batch project %s failed: %s", project["project_path"], e, exc_info=True
+            )
+            result["status"] = "failed"
+            result["error"] = str(e)
+        result["seconds"] = time.perf_counter() - start
+        result["metrics"] = dict(engineer.ai_engineer_metrics)
+        result["validation"] = engineer.ai_engineer_validation_report
+        result["dedup"] = engineer.ai_engineer_dedup_report
+        return result
+
+    def ai_engineer_run(self, projects, parallel_projects=4):
+        """
+        Run every project of the batch.
+
+        Args:
+            projects (list): Projects from ai_engineer_read_manifest.
+            parallel_projects (int, optional): Projects processed at once.
+
+        Returns:
+            dict: The consolidated report.
+        """
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=max(1, parallel_projects)) as executor:
+            results = list(executor.map(self.ai_engineer_run_project, projects))
+
+        totals = {
+            "projects": len(results),
+            "succeeded": sum(r["status"] == "succeeded" for r in results),
+            "failed": sum(r["status"] == "failed" for r in results),
+            "seconds": time.perf_counter() - start,
+        }
+        for metric in (
+            "requests",
+            "prompt_tokens",
+            "completion_tokens",
+            "network_seconds",
+        ):
+            totals[metric] = sum(r["metrics"][metric] for r in results)
+        input_price, output_price = OpenAIPlanner.MODEL_PRICING.get(
+            OpenAIEngineer.MODEL, (0.0, 0.0)
+        )
+        totals["cost"] = (
+            totals["prompt_tokens"] * input_price
+            + totals["completion_tokens"] * output_price
+        ) / 1000000
+        return {"totals": totals, "projects": results}
+
+    def ai_engineer_export_report(self, report, report_path=None):
+        """
+        Export the consolidated report as JSON.
+
+        Args:
+            report (dict): Output of ai_engineer_run.
+            report_path (str, optional): Path of the report. Defaults to a
+                timestamped file under ./ai_engineer_output.
+
+        Returns:
+            str: Path of the exported report.
+        """
+        if not report_path:
+            os.makedirs("ai_engineer_output", exist_ok=True)
+            report_path = f"ai_engineer_output/ai_engineer_batch_report_{self.init_time.strftime('%Y%m%d%H%M%S')}.json"
+        with open(report_path, "w+", encoding="utf-8") as f:
+            f.write(json.dumps(report, indent=4))
+        logger.info("Exported batch report to: %s", report_path)
+        return report_path
+
+    @staticmethod
+    def ai_engineer_format_report(report):
+        """
+        Render a batch report as human readable text.
+
+        Args:
+            report (dict): Output of ai_engineer_run.
+
+        Returns:
+            str: The formatted report.
+        """
+        totals = report["totals"]
+        lines = [
+            f"Projects: {totals['projects']} ({totals['succeeded']} succeeded, {totals['failed']} failed)",
+            f"Requests: {totals['requests']}",
+            f"Prompt tokens: {totals['prompt_tokens']}",
+            f"Completion tokens: {totals['completion_tokens']}",
+            f"Cost: ${totals['cost']:.4f}",
+            f"Wall-clock: {totals['seconds']:.1f}s (network {totals['network_seconds']:.1f}s)",
+        ]
+        for result in report["projects"]:
+            if result["status"] == "failed":
+                lines.append(f"  FAILED {result['project_path']}: {result['error']}")
+        return "\n".join(lines)
+
+    def close(self):
+        """Close the shared HTTP client."""
+        self.http_client.close()
@@ -1,20 +1,44 @@
+import contextlib
 import copy
 import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from enum import Enum
-import json
 import os
 from ..core import Core
+from ..dependency_graph import DependencyGraph
+from ..output_writer import OutputWriter
+from ..system_prompts import SystemPrompts
+from ..tracing import tracer
+from ..validation import Validator
 from openai import OpenAI
 
+logger = logging.getLogger(__name__)
+
 
 class OpenAIEngineer(Core, OpenAI):
-    def __init__(self, api_key):
+    MODEL = "gpt-4o-mini"
+
+    def __init__(self, api_key, http_client=None, request_budget=None):
         super().__init__()  # Initialize the AIEngineer
         OpenAI.__init__(
-            self, api_key=api_key
-        )  # Initialize OpenAI with the provided API key
+            self, api_key=api_key, http_client=http_client
+        )  # Initialize OpenAI with the provided API key and optional shared client
         self.ai_engineer_prompt = None
         self.project_files_history_init_cache = {}
+        self.ai_engineer_conversation_history_lock = threading.Lock()
+        self.ai_engineer_validation_report = None
+        self.ai_engineer_dedup_report = None
+        self.ai_engineer_output_writer = None
+        self.ai_engineer_request_budget = request_budget
+        self.ai_engineer_metrics_lock = threading.Lock()
+        self.ai_engineer_metrics = {
+            "requests": 0,
+            "prompt_tokens": 0,
+            "completion_tokens": 0,
+            "network_seconds": 0.0,
+        }
         self.project_root = ""
 
     class Modes(Enum):
@@ -35,13 +59,81 @@ class OpenAIEngineer(Core, OpenAI):
         """Create a prompt for the AI model with a specified role and content."""
         return {"role": role.value, "content": content}
 
-    def ai_engineer_process_history(self):
-        """Process the conversation history to get a response from the AI model."""
-        return self.chat.completions.create(
-            model="gpt-4o-mini",
-            messages=self.ai_engineer_conversation_history,
+    @classmethod
+    def ai_engineer_create_discovery_system_prompt(cls, prompt):
+        """Create the system prompt that opens an auto-file-discovery chat."""
+        return cls.ai_engineer_create_prompt(
+            cls.Roles.SYSTEM,
+            SystemPrompts.AI_ENGINEER_PROJECT_TREE_DISCOVERY.value.replace(
+                "{% prompt %}", prompt
+            ),
+        )
+
+    @classmethod
+    def ai_engineer_create_creator_prompts(cls, prompt):
+        """Create the system and user prompts that open a creator chat."""
+        return [
+            cls.ai_engineer_create_prompt(
+                cls.Roles.SYSTEM,
+                SystemPrompts.AI_ENGINEER_PROJECT_TREE_CREATOR.value,
+            ),
+            cls.ai_engineer_create_prompt(
+                cls.Roles.USER,
+                prompt
+                + "\nOnly respond with one file at a time. I will prompt you for the next file.",
+            ),
+        ]
+
+    @classmethod
+    def ai_engineer_create_editor_system_prompt(cls, prompt):
+        """Create the system prompt shared by every editor request."""
+        return cls.ai_engineer_create_prompt(
+            cls.Roles.SYSTEM,
+            SystemPrompts.AI_ENGINEER_PROJECT_TREE_EDITOR.value.format(prompt=prompt),
         )
 
+    @classmethod
+    def ai_engineer_create_editor_file_prompt(
+        cls, file_path_mask, file_content, prompt, dependency_context=""
+    ):
+        """Create the user prompt asking the model to edit a single file."""
+        dependencies = (
+            f"FILE_DEPENDENCIES:\n{dependency_context}\n" if dependency_context else ""
+        )
+        return cls.ai_engineer_create_prompt(
+            cls.Roles.USER,
+            f"FILE_PATH:{file_path_mask}\nFILE_CONTENT:\n{file_content}\n{dependencies}FILE_ACTION:{prompt}",
+        )
+
+    def ai_engineer_process_history(self, messages=None):
+        """
+        Process the conversation history to get a response from the AI model.
+
+        Args:
+            messages (list, optional): Messages to send instead of the conversation history.
+        """
+        if messages is None:
+            messages = self.ai_engineer_conversation_history
+        with self.ai_engineer_request_budget or contextlib.nullcontext():
+            with tracer.span("chat_completion", "network", messages=len(messages)):
+                start = time.perf_counter()
+                response = self.chat.completions.create(
+                    model=self.MODEL, messages=messages
+                )
+                network_seconds = time.perf_counter() - start
+
+        with self.ai_engineer_metrics_lock:
+            self.ai_engineer_metrics["requests"] += 1
+            self.ai_engineer_metrics["network_seconds"] += network_seconds
+            if response.usage is not None:
+                self.ai_engineer_metrics[
+                    "prompt_tokens"
+                ] += response.usage.prompt_tokens
+                self.ai_engineer_metrics[
+                    "completion_tokens"
+                ] += response.usage.completion_tokens
+        return response
+
     def ai_engineer_project_tree_prompt(
         self,
         project_path,
@@ -52,12 +144,63 @@ class OpenAIEngineer(Core, OpenAI):
         gitignore_file_path="",
         overwrite=False,
         max_chat_iterations=25,
+        concurrency=1,
+        max_validation_retries=2,
+        dedup_identical_files=False,
+        fsync="never",
+        stage_outputs=False,
+    ):
+        """
+        Main function to process project files with the AI model.
+
+        Outputs are written in the background by an OutputWriter. fsync is its
+        fsync policy. stage_outputs applies every output together at the end
+        of the run, leaving the project untouched if the run fails.
+        """
+        writer = OutputWriter(fsync=fsync, staged=stage_outputs)
+        self.ai_engineer_output_writer = writer
+        try:
+            self.ai_engineer_process_project_tree(
+                project_path,
+                prompt,
+                mode,
+                auto_file_discovery,
+                reuse_auto_file_discovery,
+                gitignore_file_path,
+                overwrite,
+                max_chat_iterations,
+                concurrency,
+                max_validation_retries,
+                dedup_identical_files,
+            )
+        except BaseException:
+            writer.abort()
+            raise
+        finally:
+            self.ai_engineer_output_writer = None
+        writer.close()
+
+    def ai_engineer_process_project_tree(
+        self,
+        project_path,
+        prompt,
+        mode: Modes,
+        auto_file_discovery=False,
+        reuse_auto_file_discovery=False,
+        gitignore_file_path="",
+        overwrite=False,
+        max_chat_iterations=25,
+        concurrency=1,
+        max_validation_retries=2,
+        dedup_identical_files=False,
     ):
-        """Main function to process project files with the AI model."""
+        """Process project files with the AI model, queueing outputs on the writer."""
         chat_iterations = 0
         self.project_root = project_path
-        project_dir_structure = self.ai_engineer_build_dir_structure(
-            self.project_root, self.project_root + "/" + gitignore_file_path
+        project_tree = self.ai_engineer_build_project_tree(
+            self.project_root,
+            self.project_root + "/" + gitignore_file_path,
+            hash_contents=dedup_identical_files and mode == self.Modes.EDITOR.value,
         )
 
         # Reset the conversation history
@@ -67,23 +210,18 @@ class OpenAIEngineer(Core, OpenAI):
             latest_auto_context = self.ai_engineer_import_auto_context_latest()
             if latest_auto_context:
                 self.ai_engineer_conversation_history = latest_auto_context
-                logging.info("Reusing the latest auto-context from the previous run.")
+                logger.info("Reusing the latest auto-context from the previous run.")
             else:
-                logging.info(
+                logger.info(
                     "No auto-context found from the previous run. Running the model without auto-context."
                 )
         elif auto_file_discovery:
             self.ai_engineer_conversation_history_append(
-                self.ai_engineer_create_prompt(
-                    self.Roles.SYSTEM,
-                    self.ai_engineer_system_prompts.AI_ENGINEER_PROJECT_TREE_DISCOVERY.value.replace(
-                        "{% prompt %}", prompt
-                    ),
-                )
+                self.ai_engineer_create_discovery_system_prompt(prompt)
             )
             self.ai_engineer_conversation_history_append(
                 self.ai_engineer_create_prompt(
-                    self.Roles.USER, json.dumps(project_dir_structure)
+                    self.Roles.USER, project_tree.ai_engineer_encode()
                 )
             )
             response = self.ai_engineer_process_history()
@@ -110,7 +248,7 @@ class OpenAIEngineer(Core, OpenAI):
                         self.Roles.USER, file_content
                     )
                 else:
-                    logging.error(
+                    logger.error(
                         "Could not find specified file at file path: %s",
                         requested_project_file_path,
                     )
@@ -127,49 +265,51 @@ class OpenAIEngineer(Core, OpenAI):
                 chat_iterations == max_chat_iterations
                 and not "AI-ENGINEER:READY" in response_choice
             ):
-                logging.info(
+                logger.info(
                     "The model did not respond with AI-ENGINEER:READY after %s iterations.",
                     max_chat_iterations,
                 )
             else:
-                logging.info("Auto-context generated successfully.")
+                logger.info("Auto-context generated successfully.")
             self.ai_engineer_export_conversation_history("ai_engineer_auto_context")
 
         # Process the project files based on the mode
         if mode == self.Modes.CREATOR.value:
-            context_prompt = self.ai_engineer_create_prompt(
-                self.Roles.SYSTEM,
-                self.ai_engineer_system_prompts.AI_ENGINEER_PROJECT_TREE_CREATOR.value,
-            )
-            self.ai_engineer_conversation_history_append(context_prompt)
-            user_prompt = self.ai_engineer_create_prompt(
-                self.Roles.USER,
-                prompt
-                + "\nOnly respond with one file at a time. I will prompt you for the next file.",
-            )
-            self.ai_engineer_conversation_history_append(user_prompt)
+            for creator_prompt in self.ai_engineer_create_creator_prompts(prompt):
+                self.ai_engineer_conversation_history_append(creator_prompt)
             response = self.ai_engineer_process_history()
             response_choice = response.choices[-1].message.content
             self.ai_engineer_conversation_history_append(
                 self.ai_engineer_create_prompt(self.Roles.ASSISTANT, response_choice)
             )
+            created_files = {}
+            validation_failed = set()
+            validation_errors = {}
+            validation_retries = 0
             while (
                 not "AI-ENGINEER:DONE" in response_choice
                 and chat_iterations < max_chat_iterations
             ):
-                ai_project_file_path, parsed_file_content = (
-                    self.ai_engineer_parse_response(response_choice)
-                )
-                ai_project_file_path = ai_project_file_path.replace(
-                    "project_root", self.project_root, 1
+                ai_project_file_path_mask, parsed_file_content, error, retries = (
+                    self.ai_engineer_validate_created_file(
+                        response_choice, max_validation_retries
+                    )
                 )
-                if not overwrite:
-                    ai_project_file_path = f"{ai_project_file_path}.ai_engineer"
-
-                # create path if not exists
-                os.makedirs(os.path.dirname(ai_project_file_path), exist_ok=True)
-                with open(ai_project_file_path, "w+", encoding="utf-8") as f:
-                    f.write(parsed_file_content)
+                created_files[ai_project_file_path_mask] = parsed_file_content
+                validation_retries += retries
+                if retries or error:
+                    validation_failed.add(ai_project_file_path_mask)
+                if error:
+                    validation_errors[ai_project_file_path_mask] = error
+                else:
+                    validation_errors.pop(ai_project_file_path_mask, None)
+                    self.ai_engineer_write_file(
+                        ai_project_file_path_mask.replace(
+                            "project_root", self.project_root, 1
+                        ),
+                        parsed_file_content,
+                        overwrite,
+                    )
                 self.ai_engineer_conversation_history_append(
                     self.ai_engineer_create_prompt(
                         self.Roles.USER, "Thank you. Next file please."
@@ -188,75 +328,418 @@ class OpenAIEngineer(Core, OpenAI):
                 chat_iterations == max_chat_iterations
                 and not "AI-ENGINEER:DONE" in response_choice
             ):
-                logging.info(
+                logger.info(
                     "The model did not respond with AI-ENGINEER:DONE after %s iterations.",
                     max_chat_iterations,
                 )
             else:
-                logging.info("Project files created successfully.")
+                logger.info("Project files created successfully.")
+            self.ai_engineer_validation_report = self.ai_engineer_report_validation(
+                created_files, validation_failed, validation_errors, validation_retries
+            )
         elif mode == self.Modes.EDITOR.value:
-            context_prompt = self.ai_engineer_create_prompt(
-                self.Roles.SYSTEM,
-                self.ai_engineer_system_prompts.AI_ENGINEER_PROJECT_TREE_EDITOR.value.format(
-                    prompt=prompt
-                ),
+            self.ai_engineer_conversation_history_append(
+                self.ai_engineer_create_editor_system_prompt(prompt)
             )
-            self.ai_engineer_conversation_history_append(context_prompt)
 
             # Cache the initial conversation history
             self.project_files_history_init_cache = copy.deepcopy(
                 self.ai_engineer_conversation_history
             )
 
-            # Flatten the project directory structure
-            project_dir_structure_flat = self.ai_engineer_flatten_dir_structure(
-                project_dir_structure
+            dependency_graph = DependencyGraph(
+                self.project_root, project_tree.ai_engineer_file_paths()
             )
-            for (
-                system_project_file_path_mask,
-                nested,
-            ) in project_dir_structure_flat.items():
-                if nested is None:
-                    system_project_file_path = system_project_file_path_mask.replace(
-                        "project_root", self.project_root, 1
-                    )
-                    # Reset the conversation history for each file
-                    self.ai_engineer_conversation_history = (
-                        self.project_files_history_init_cache
-                    )
-                    logging.info("Processing file: %s", system_project_file_path)
-                    with open(system_project_file_path, "r", encoding="utf-8") as f:
-                        file_content = f.read()
-                    prompt_content = f"FILE_PATH:{system_project_file_path_mask}\nFILE_CONTENT:\n{file_content}\nFILE_ACTION:{prompt}"
-                    self.ai_engineer_conversation_history_append(
-                        self.ai_engineer_create_prompt(self.Roles.USER, prompt_content)
-                    )
+            file_digests = project_tree.ai_engineer_file_digests()
 
-                    response = self.ai_engineer_process_history()
-                    response_choice = response.choices[-1].message.content
-                    self.ai_engineer_conversation_history_append(
-                        self.ai_engineer_create_prompt(
-                            self.Roles.ASSISTANT, response_choice
+            # Edit callees before callers, files of a level in parallel. Each level
+            # is validated, retried and written before the next one is prompted
+            public_signatures = {}
+            edits = {}
+            validation_failed = set()
+            validation_errors = {}
+            validation_retries = 0
+            # Identical files with the same extension and dependency context
+            # are requested once through a representative
+            representatives = {}
+            duplicates = {}
+            with ThreadPoolExecutor(max_workers=max(1, concurrency)) as executor:
+                for level in dependency_graph.ai_engineer_levels():
+                    futures = {}
+                    level_duplicates = []
+                    for system_project_file_path_mask in level:
+                        dependency_context = "\n".join(
+                            f"# {dependency}\n{public_signatures[dependency]}"
+                            for dependency in sorted(
+                                dependency_graph.dependencies[
+                                    system_project_file_path_mask
+                                ]
+                            )
+                            if public_signatures.get(dependency)
                         )
-                    )
+                        if system_project_file_path_mask in file_digests:
+                            content_key = (
+                                file_digests[system_project_file_path_mask],
+                                os.path.splitext(system_project_file_path_mask)[1],
+                                dependency_context,
+                            )
+                            if content_key in representatives:
+                                representative = representatives[content_key]
+                                duplicates[representative].append(
+                                    system_project_file_path_mask
+                                )
+                                level_duplicates.append(
+                                    (representative, system_project_file_path_mask)
+                                )
+                                continue
+                            representatives[content_key] = system_project_file_path_mask
+                            duplicates[system_project_file_path_mask] = []
+                        future = executor.submit(
+                            self.ai_engineer_edit_file,
+                            system_project_file_path_mask,
+                            prompt,
+                            dependency_context,
+                        )
+                        futures[future] = system_project_file_path_mask
+                    for future in as_completed(futures):
+                        edits[futures[future]] = future.result()
 
-                    ai_project_file_path_mask, parsed_file_content = (
-                        self.ai_engineer_parse_response(response_choice)
+                    failed, errors, retries = self.ai_engineer_validate_edits(
+                        edits,
+                        list(futures.values()),
+                        max_validation_retries,
+                        concurrency,
                     )
-                    ai_project_file_path = ai_project_file_path_mask.replace(
-                        "project_root", self.project_root, 1
+                    validation_failed |= failed
+                    validation_errors.update(errors)
+                    validation_retries += retries
+
+                    # Only files passing validation are written
+                    level_writes = [
+                        (file_path_mask, file_path_mask)
+                        for file_path_mask in futures.values()
+                    ] + level_duplicates
+                    for representative, file_path_mask in level_writes:
+                        edits[file_path_mask] = edits[representative]
+                        if representative not in validation_errors:
+                            self.ai_engineer_write_file(
+                                file_path_mask.replace(
+                                    "project_root", self.project_root, 1
+                                ),
+                                edits[representative][0],
+                                overwrite,
+                            )
+                    # Every request of the level, retries included, has completed
+                    self.ai_engineer_export_conversation_history()
+                    for system_project_file_path_mask in level:
+                        if system_project_file_path_mask.endswith(".py"):
+                            public_signatures[system_project_file_path_mask] = (
+                                dependency_graph.ai_engineer_public_signatures(
+                                    edits[system_project_file_path_mask][0] or ""
+                                )
+                            )
+
+            duplicates = {
+                representative: file_path_masks
+                for representative, file_path_masks in duplicates.items()
+                if file_path_masks
+            }
+            self.ai_engineer_dedup_report = {
+                "files": len(edits),
+                "requests": len(edits) - sum(map(len, duplicates.values())),
+                "duplicates": sum(map(len, duplicates.values())),
+                "duplicate_groups": len(duplicates),
+            }
+            if dedup_identical_files:
+                logger.info(
+                    "Deduplication summary: %d files edited with %d requests, %d duplicates in %d groups.",
+                    self.ai_engineer_dedup_report["files"],
+                    self.ai_engineer_dedup_report["requests"],
+                    self.ai_engineer_dedup_report["duplicates"],
+                    self.ai_engineer_dedup_report["duplicate_groups"],
+                )
+            self.ai_engineer_validation_report = self.ai_engineer_report_validation(
+                edits,
+                validation_failed,
+                validation_errors,
+                validation_retries,
+                duplicates,
+            )
+
+    def ai_engineer_validate_created_file(
+        self, response_choice, max_validation_retries
+    ):
+        """
+        Validate a file of the creator chat, asking again in the chat while it fails.
+
+        Args:
+            response_choice (str): The AI model's response holding the file.
+            max_validation_retries (int): Retries for a failing file.
+
+        Returns:
+            tuple: The file path starting with project_root/, the file content,
+            the validation error of the last response or None, and the number
+            of retries.
+        """
+        ai_project_file_path_mask, parsed_file_content = (
+            self.ai_engineer_parse_response(response_choice)
+        )
+        error = self.ai_engineer_validate_created_content(
+            ai_project_file_path_mask, parsed_file_content
+        )
+        retries = 0
+        while error is not None and retries < max_validation_retries:
+            logger.info("Retrying file: %s (%s)", ai_project_file_path_mask, error)
+            self.ai_engineer_conversation_history_append(
+                self.ai_engineer_create_prompt(
+                    self.Roles.USER,
+                    f"FILE_PATH:{ai_project_file_path_mask}\nFILE_VALIDATION_ERROR:{error}\n"
+                    "Respond again with the complete, corrected FILE_PATH and FILE_CONTENT.",
+                )
+            )
+            response = self.ai_engineer_process_history()
+            response_choice = response.choices[-1].message.content
+            self.ai_engineer_conversation_history_append(
+                self.ai_engineer_create_prompt(self.Roles.ASSISTANT, response_choice)
+            )
+            retries += 1
+            ai_project_file_path_mask, parsed_file_content = (
+                self.ai_engineer_parse_response(response_choice)
+            )
+            error = self.ai_engineer_validate_created_content(
+                ai_project_file_path_mask, parsed_file_content
+            )
+        return ai_project_file_path_mask, parsed_file_content, error, retries
+
+    @staticmethod
+    def ai_engineer_validate_created_content(ai_project_file_path_mask, file_content):
+        """Validate a parsed creator response, which must name the file it holds."""
+        if not ai_project_file_path_mask.startswith("project_root/"):
+            return "Expected FILE_PATH:project_root/<path> followed by a FILE_CONTENT."
+        return Validator.ai_engineer_validate_content(
+            ai_project_file_path_mask, file_content
+        )
+
+    def ai_engineer_edit_file(
+        self, system_project_file_path_mask, prompt, dependency_context=""
+    ):
+        """
+        Edit a single project file in its own chat, seeded with the cached context.
+
+        The edit is not written, see ai_engineer_validate_edits.
+
+        Args:
+            system_project_file_path_mask (str): File path starting with project_root/.
+            prompt (str): The user prompt.
+            dependency_context (str, optional): Public signatures of the already
+                edited files this file imports.
+
+        Returns:
+            tuple: The edited file content, or None if the response was rejected,
+            and the messages of the file's chat.
+        """
+        system_project_file_path = system_project_file_path_mask.replace(
+            "project_root", self.project_root, 1
+        )
+        logger.info("Processing file: %s", system_project_file_path)
+        with tracer.span("build_prompt", "prompt", file=system_project_file_path_mask):
+            with open(system_project_file_path, "r", encoding="utf-8") as f:
+                file_content = f.read()
+            file_prompt = self.ai_engineer_create_editor_file_prompt(
+                system_project_file_path_mask, file_content, prompt, dependency_context
+            )
+        return self.ai_engineer_request_file_edit(
+            system_project_file_path_mask,
+            self.project_files_history_init_cache + [file_prompt],
+        )
+
+    def ai_engineer_retry_file(self, system_project_file_path_mask, messages, error):
+        """
+        Ask again for a file whose edit failed validation, quoting the error.
+
+        Args:
+            system_project_file_path_mask (str): File path starting with project_root/.
+            messages (list): The messages of the file's chat so far.
+            error (str): The validation error of the last response.
+
+        Returns:
+            tuple: As ai_engineer_edit_file.
+        """
+        logger.info("Retrying file: %s (%s)", system_project_file_path_mask, error)
+        retry_prompt = self.ai_engineer_create_prompt(
+            self.Roles.USER,
+            f"FILE_PATH:{system_project_file_path_mask}\nFILE_VALIDATION_ERROR:{error}\n"
+            "Respond again with the complete, corrected FILE_PATH and FILE_CONTENT.",
+        )
+        return self.ai_engineer_request_file_edit(
+            system_project_file_path_mask, messages + [retry_prompt]
+        )
+
+    def ai_engineer_request_file_edit(self, system_project_file_path_mask, messages):
+        """
+        Send a file's chat to the AI model and parse the edited file.
+
+        Safe to call from several threads at once: the exchange is appended to the
+        shared conversation history only after the response arrives. Responses for
+        another file or without exactly one code block are rejected.
+
+        Returns:
+            tuple: As ai_engineer_edit_file.
+        """
+        system_project_file_path = system_project_file_path_mask.replace(
+            "project_root", self.project_root, 1
+        )
+        response = self.ai_engineer_process_history(messages)
+        response_choice = response.choices[-1].message.content
+        reply = self.ai_engineer_create_prompt(self.Roles.ASSISTANT, response_choice)
+        with self.ai_engineer_conversation_history_lock:
+            # Exported once per level instead of on every reply
+            self.ai_engineer_conversation_history.extend((messages[-1], reply))
+        messages = messages + [reply]
+
+        ai_project_file_path_mask, parsed_file_content = (
+            self.ai_engineer_parse_response(response_choice)
+        )
+        ai_project_file_path = ai_project_file_path_mask.replace(
+            "project_root", self.project_root, 1
+        )
+
+        if os.path.realpath(system_project_file_path) != os.path.realpath(
+            ai_project_file_path
+        ):
+            logger.error(
+                "File path mismatch: file_path_input:%s != file_path_output:%s",
+                system_project_file_path,
+                ai_project_file_path,
+            )
+            return None, messages
+
+        if len(self.ai_engineer_extract_markdown_code_blocks(response_choice)) != 1:
+            logger.error(
+                "Expected exactly one code block for file: %s", system_project_file_path
+            )
+            return None, messages
+
+        return parsed_file_content, messages
+
+    def ai_engineer_write_file(self, ai_project_file_path, file_content, overwrite):
+        """
+        Queue a file on the output writer, next to the original unless overwriting it.
+
+        Args:
+            ai_project_file_path (str): Path of the file on disk.
+            file_content (str): The file content.
+            overwrite (bool): Overwrite the file instead of writing a .ai_engineer copy.
+        """
+        source_path = ai_project_file_path
+        if not overwrite:
+            ai_project_file_path = f"{ai_project_file_path}.ai_engineer"
+        self.ai_engineer_output_writer.submit(
+            ai_project_file_path, file_content, source_path
+        )
+
+    def ai_engineer_validate_edits(
+        self, edits, file_path_masks, max_validation_retries=2, concurrency=1
+    ):
+        """
+        Validate edited files and re-request the failing ones.
+
+        Args:
+            edits (dict): Maps file paths to (file_content, messages) tuples as
+                returned by ai_engineer_edit_file. Updated with the retries.
+            file_path_masks (list): File paths of the edits to validate.
+            max_validation_retries (int, optional): Retries per failing file.
+            concurrency (int, optional): Retries in flight at once.
+
+        Returns:
+            tuple: The files that failed at first, the validation errors of the
+            files still failing and the number of retries.
+        """
+
+        def validate(file_path_masks):
+            errors = Validator.ai_engineer_validate_files(
+                {
+                    file_path_mask: edits[file_path_mask][0]
+                    for file_path_mask in file_path_masks
+                    if edits[file_path_mask][0] is not None
+                }
+            )
+            for file_path_mask in file_path_masks:
+                if edits[file_path_mask][0] is None:
+                    errors[file_path_mask] = (
+                        f"Expected FILE_PATH:{file_path_mask} followed by a FILE_CONTENT "
+                        "with exactly one code block."
                     )
+            return errors
 
-                    if os.path.realpath(system_project_file_path) == os.path.realpath(
-                        ai_project_file_path
-                    ):
-                        if not overwrite:
-                            ai_project_file_path = f"{ai_project_file_path}.ai_engineer"
-                        with open(ai_project_file_path, "w+", encoding="utf-8") as f:
-                            f.write(parsed_file_content)
-                    else:
-                        logging.error(
-                            "File path mismatch: file_path_input:%s != file_path_output:%s",
-                            system_project_file_path,
-                            ai_project_file_path,
-                        )
+        with tracer.span("validate_files", "validate", files=len(file_path_masks)):
+            errors = validate(file_path_masks)
+        failed = set(errors)
+        retries = 0
+        for _ in range(max_validation_retries):
+            if not errors:
+                break
+            with ThreadPoolExecutor(max_workers=max(1, concurrency)) as executor:
+                futures = {
+                    executor.submit(
+                        self.ai_engineer_retry_file,
+                        file_path_mask,
+                        edits[file_path_mask][1],
+                        error,
+                    ): file_path_mask
+                    for file_path_mask, error in errors.items()
+                }
+                for future in as_completed(futures):
+                    edits[futures[future]] = future.result()
+            retries += len(futures)
+            with tracer.span("validate_files", "validate", files=len(errors)):
+                errors = validate(list(errors))
+        return failed, errors, retries
+
+    @staticmethod
+    def ai_engineer_report_validation(edits, failed, errors, retries, duplicates=None):
+        """
+        Summarise the validation of a run and log the files still failing.
+
+        Duplicates share their representative's edit, so only representatives
+        are validated and retried, and their results count for the duplicates.
+
+        Args:
+            edits (dict): Maps file paths to (file_content, messages) tuples.
+            failed (set): Representatives that failed validation at first.
+            errors (dict): Validation errors of the representatives still failing.
+            retries (int): Number of retries.
+            duplicates (dict, optional): Maps representatives to their duplicates.
+
+        Returns:
+            dict: The validation report.
+        """
+        duplicates = duplicates or {}
+        failed = {
+            file_path_mask
+            for representative in failed
+            for file_path_mask in [representative] + duplicates.get(representative, [])
+        }
+        errors = {
+            file_path_mask: errors[representative]
+            for representative in errors
+            for file_path_mask in [representative] + duplicates.get(representative, [])
+        }
+        report = {
+            "checked": len(edits),
+            "failed": len(failed),
+            "fixed": len(failed - set(errors)),
+            "retries": retries,
+            "errors": errors,
+        }
+        logger.info(
+            "Validation summary: %d files checked, %d failed, %d fixed by %d retries, %d still failing.",
+            report["checked"],
+            report["failed"],
+            report["fixed"],
+            report["retries"],
+            len(errors),
+        )
+        for file_path_mask, error in errors.items():
+            logger.error("Validation failed for %s: %s", file_path_mask, error)
+        return report
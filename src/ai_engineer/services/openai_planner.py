@@ -0,0 +1,369 @@
+"""
+The OpenAIPlanner class estimates the tokens, cost and wall-clock time of an
+OpenAIEngineer run without making any network calls.
+"""
+
+import logging
+import math
+import os
+from collections import defaultdict
+
+from ..core import Core
+from ..dependency_graph import DependencyGraph
+from .openai_engineer import OpenAIEngineer
+
+try:
+    import tiktoken
+except ImportError:  # pragma: no cover - optional dependency
+    tiktoken = None
+
+logger = logging.getLogger(__name__)
+
+
+class OpenAIPlanner(Core):
+    """
+    Dry-run planner for OpenAIEngineer.
+
+    Token counts use a characters-per-token heuristic, or tiktoken when enabled.
+    tiktoken downloads the model's encoding on first use, so it is opt-in to keep
+    planning free of network calls unless the encoding is already cached.
+
+    Attributes:
+        model (str): Model whose pricing is used for the cost estimate.
+        concurrency (int): Number of editor requests in flight at once.
+        requests_per_minute (int): Request rate limit of the API key, 0 for none.
+        tokens_per_minute (int): Token rate limit of the API key, 0 for none.
+        base_latency (float): Fixed latency of a single request in seconds.
+        output_tokens_per_second (float): Generation speed of the model.
+        assumed_output_tokens (int): Output tokens assumed for a chat turn whose
+            response size cannot be derived from an existing file.
+        use_tiktoken (bool): Count tokens exactly with tiktoken.
+    """
+
+    # USD per 1M (input, output) tokens
+    MODEL_PRICING = {
+        "gpt-4o-mini": (0.15, 0.60),
+        "gpt-4o": (2.50, 10.00),
+    }
+    CHARS_PER_TOKEN = 4
+    MESSAGE_OVERHEAD_TOKENS = 4
+    REPLY_OVERHEAD_TOKENS = 3
+
+    def __init__(
+        self,
+        model=OpenAIEngineer.MODEL,
+        concurrency=1,
+        requests_per_minute=500,
+        tokens_per_minute=200000,
+        base_latency=1.0,
+        output_tokens_per_second=80.0,
+        assumed_output_tokens=800,
+        use_tiktoken=False,
+    ):
+        super().__init__()
+        for name, limit in (
+            ("requests_per_minute", requests_per_minute),
+            ("tokens_per_minute", tokens_per_minute),
+        ):
+            if limit < 0:
+                raise ValueError(f"{name} must not be negative, got {limit}.")
+        self.model = model
+        self.concurrency = max(1, concurrency)
+        self.requests_per_minute = requests_per_minute
+        self.tokens_per_minute = tokens_per_minute
+        self.base_latency = base_latency
+        self.output_tokens_per_second = output_tokens_per_second
+        self.assumed_output_tokens = assumed_output_tokens
+        self.encoding = None
+        if use_tiktoken and tiktoken is None:
+            logger.warning("tiktoken is not installed.")
+        elif use_tiktoken:
+            try:
+                try:
+                    self.encoding = tiktoken.encoding_for_model(model)
+                except KeyError:
+                    self.encoding = tiktoken.get_encoding("o200k_base")
+            except Exception as e:  # pylint: disable=broad-except
+                # tiktoken downloads encodings that are not cached yet
+                logger.warning("Could not load the tiktoken encoding: %s", e)
+        if self.encoding is None:
+            logger.info(
+                "Estimating tokens at %d characters per token.", self.CHARS_PER_TOKEN
+            )
+
+    def ai_engineer_count_tokens(self, text):
+        """
+        Count the tokens of a piece of text.
+
+        Args:
+            text (str): Text to count.
+
+        Returns:
+            int: Number of tokens.
+        """
+        if self.encoding is not None:
+            return len(self.encoding.encode(text, disallowed_special=()))
+        return math.ceil(len(text) / self.CHARS_PER_TOKEN)
+
+    def ai_engineer_count_messages_tokens(self, messages):
+        """
+        Count the prompt tokens of a chat completion request.
+
+        Args:
+            messages (list): Chat messages as built by OpenAIEngineer.
+
+        Returns:
+            int: Number of prompt tokens.
+        """
+        return self.REPLY_OVERHEAD_TOKENS + sum(
+            self.MESSAGE_OVERHEAD_TOKENS + self.ai_engineer_count_tokens(m["content"])
+            for m in messages
+        )
+
+    def ai_engineer_read_project_files(self, project_tree):
+        """
+        Read every file of the project tree and count its tokens.
+
+        Args:
+            project_tree (ProjectTree): Output of ai_engineer_build_project_tree.
+
+        Returns:
+            dict: Maps each file path mask to a (file_content, tokens) tuple.
+        """
+        project_files = {}
+        for file_path_mask in project_tree.ai_engineer_file_paths():
+            file_path = file_path_mask.replace("project_root", self.project_root, 1)
+            try:
+                with open(file_path, "r", encoding="utf-8") as f:
+                    file_content = f.read()
+            except UnicodeDecodeError:
+                logger.warning("Skipping non UTF-8 file: %s", file_path)
+                continue
+            project_files[file_path_mask] = (
+                file_content,
+                self.ai_engineer_count_tokens(file_content),
+            )
+        return project_files
+
+    def ai_engineer_plan_chat(
+        self, history, turns, user_tokens, label, context_tokens=0
+    ):
+        """
+        Plan a sequential chat whose history grows with every turn.
+
+        Args:
+            history (list): Messages sent with the first request.
+            turns (int): Number of follow-up requests.
+            user_tokens (int): Tokens of each follow-up user message.
+            label (str): Label of the requests in the plan.
+            context_tokens (int, optional): Tokens of a preceding chat the history extends.
+
+        Returns:
+            tuple: The planned requests and the prompt tokens of the final history.
+        """
+        requests = []
+        input_tokens = context_tokens + self.ai_engineer_count_messages_tokens(history)
+        for turn in range(turns + 1):
+            requests.append(
+                {
+                    "label": f"{label}#{turn}",
+                    "input_tokens": input_tokens,
+                    "output_tokens": self.assumed_output_tokens,
+                }
+            )
+            input_tokens += (
+                self.assumed_output_tokens
+                + user_tokens
+                + 2 * self.MESSAGE_OVERHEAD_TOKENS
+            )
+        return requests, input_tokens
+
+    def ai_engineer_request_latency(self, request):
+        """Estimate the latency of a single request in seconds."""
+        return (
+            self.base_latency + request["output_tokens"] / self.output_tokens_per_second
+        )
+
+    def ai_engineer_project_tree_plan(
+        self,
+        project_path,
+        prompt,
+        mode,
+        auto_file_discovery=False,
+        reuse_auto_file_discovery=False,
+        gitignore_file_path="",
+        max_chat_iterations=25,
+    ):
+        """
+        Predict the requests OpenAIEngineer.ai_engineer_project_tree_prompt would make.
+
+        Creator and discovery chats are planned at their max_chat_iterations upper
+        bound, as their length is decided by the model.
+
+        Returns:
+            dict: The plan report.
+        """
+        self.project_root = project_path
+        project_tree = self.ai_engineer_build_project_tree(
+            self.project_root, self.project_root + "/" + gitignore_file_path
+        )
+        project_files = self.ai_engineer_read_project_files(project_tree)
+
+        sequential_requests = []
+        parallel_requests = []
+        context_tokens = 0
+
+        if reuse_auto_file_discovery:
+            if os.path.isdir(f"{self.project_root}/ai_engineer_output"):
+                context_tokens = self.ai_engineer_count_messages_tokens(
+                    self.ai_engineer_import_auto_context_latest()
+                )
+        elif auto_file_discovery:
+            average_file_tokens = (
+                sum(tokens for _, tokens in project_files.values())
+                // len(project_files)
+                if project_files
+                else 0
+            )
+            requests, context_tokens = self.ai_engineer_plan_chat(
+                [
+                    OpenAIEngineer.ai_engineer_create_discovery_system_prompt(prompt),
+                    OpenAIEngineer.ai_engineer_create_prompt(
+                        OpenAIEngineer.Roles.USER, project_tree.ai_engineer_encode()
+                    ),
+                ],
+                max_chat_iterations,
+                average_file_tokens,
+                "discovery",
+            )
+            sequential_requests.extend(requests)
+
+        if mode == OpenAIEngineer.Modes.CREATOR.value:
+            requests, _ = self.ai_engineer_plan_chat(
+                OpenAIEngineer.ai_engineer_create_creator_prompts(prompt),
+                max_chat_iterations,
+                self.ai_engineer_count_tokens("Thank you. Next file please."),
+                "creator",
+                context_tokens,
+            )
+            sequential_requests.extend(requests)
+        elif mode == OpenAIEngineer.Modes.EDITOR.value:
+            # Every editor request resends the discovery context and system prompt
+            context_tokens += self.ai_engineer_count_messages_tokens(
+                [OpenAIEngineer.ai_engineer_create_editor_system_prompt(prompt)]
+            )
+            levels = DependencyGraph(
+                self.project_root, project_files
+            ).ai_engineer_levels()
+            for level, file_path_masks in enumerate(levels):
+                for file_path_mask in file_path_masks:
+                    file_content, _ = project_files[file_path_mask]
+                    file_prompt = OpenAIEngineer.ai_engineer_create_editor_file_prompt(
+                        file_path_mask, file_content, prompt
+                    )
+                    parallel_requests.append(
+                        {
+                            "label": file_path_mask,
+                            "level": level,
+                            "input_tokens": context_tokens
+                            + self.ai_engineer_count_messages_tokens([file_prompt]),
+                            "output_tokens": self.ai_engineer_count_tokens(
+                                f"FILE_PATH:{file_path_mask}\nFILE_CONTENT:\n```\n{file_content}\n```"
+                            ),
+                        }
+                    )
+
+        return self.ai_engineer_summarise_plan(
+            sequential_requests, parallel_requests, project_files
+        )
+
+    def ai_engineer_summarise_plan(
+        self, sequential_requests, parallel_requests, project_files
+    ):
+        """
+        Aggregate planned requests into totals, cost and wall-clock time.
+
+        Sequential requests run one after the other. Parallel requests run one
+        dependency level after the other, each level spread over the configured
+        concurrency. Both are bounded by the rate limits that are not 0.
+
+        Returns:
+            dict: The plan report.
+        """
+        requests = sequential_requests + parallel_requests
+        input_tokens = sum(r["input_tokens"] for r in requests)
+        output_tokens = sum(r["output_tokens"] for r in requests)
+        input_price, output_price = self.MODEL_PRICING.get(self.model, (0.0, 0.0))
+        cost = (input_tokens * input_price + output_tokens * output_price) / 1000000
+
+        sequential_seconds = sum(
+            self.ai_engineer_request_latency(r) for r in sequential_requests
+        )
+        level_latencies = defaultdict(list)
+        for r in parallel_requests:
+            level_latencies[r["level"]].append(self.ai_engineer_request_latency(r))
+        parallel_seconds = sum(
+            max(sum(latencies) / self.concurrency, max(latencies))
+            for latencies in level_latencies.values()
+        )
+        wall_clock_seconds = sequential_seconds + parallel_seconds
+        if self.requests_per_minute:
+            wall_clock_seconds = max(
+                wall_clock_seconds, len(requests) / self.requests_per_minute * 60
+            )
+        if self.tokens_per_minute:
+            wall_clock_seconds = max(
+                wall_clock_seconds,
+                (input_tokens + output_tokens) / self.tokens_per_minute * 60,
+            )
+
+        directories = defaultdict(lambda: {"tokens": 0, "files": []})
+        for file_path_mask, (_, tokens) in project_files.items():
+            directory = directories[os.path.dirname(file_path_mask)]
+            directory["tokens"] += tokens
+            directory["files"].append((file_path_mask, tokens))
+        for directory in directories.values():
+            directory["files"].sort(key=lambda file: file[1], reverse=True)
+
+        return {
+            "model": self.model,
+            "requests": len(requests),
+            "input_tokens": input_tokens,
+            "output_tokens": output_tokens,
+            "cost": cost,
+            "wall_clock_seconds": wall_clock_seconds,
+            "concurrency": self.concurrency,
+            "directories": dict(
+                sorted(directories.items(), key=lambda d: d[1]["tokens"], reverse=True)
+            ),
+        }
+
+    @staticmethod
+    def ai_engineer_format_plan(plan, top_directories=10, top_files=3):
+        """
+        Render a plan report as human readable text.
+
+        Args:
+            plan (dict): Output of ai_engineer_project_tree_plan.
+            top_directories (int, optional): Heaviest directories listed.
+            top_files (int, optional): Heaviest files listed per directory.
+
+        Returns:
+            str: The formatted report.
+        """
+        lines = [
+            f"Model: {plan['model']} (concurrency {plan['concurrency']})",
+            f"Requests: {plan['requests']}",
+            f"Input tokens: {plan['input_tokens']}",
+            f"Output tokens: {plan['output_tokens']}",
+            f"Estimated cost: ${plan['cost']:.4f}",
+            f"Estimated wall-clock: {plan['wall_clock_seconds']:.1f}s",
+            "Not included: --dedup_identical_files savings, dependency context "
+            "tokens and validation retries.",
+            "Heaviest files per directory:",
+        ]
+        for directory, summary in list(plan["directories"].items())[:top_directories]:
+            lines.append(f"  {directory}/ ({summary['tokens']} tokens)")
+            for file_path_mask, tokens in summary["files"][:top_files]:
+                lines.append(f"    {os.path.basename(file_path_mask)}: {tokens}")
+        return "\n".join(lines)
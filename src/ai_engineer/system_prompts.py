@@ -3,22 +3,16 @@ from enum import Enum
 
 class SystemPrompts(Enum):
     AI_ENGINEER_PROJECT_TREE_DISCOVERY = """
-        Directory structure JSON template...
-        {
-            "root": {
-                "dir1": {
-                    "file1.txt": null,
-                    "file2.txt": null
-                },
-                "dir2": {
-                    "subdir1": {
-                        "file3.txt": null
-                    },
-                    "subdir2": {}
-                },
-                "file4.txt": null
-            }
-        }  
+        Directory structure template, one entry per line, indented by one space per level, directories ending with "/"...
+        project_root/
+         dir1/
+          file1.txt
+          file2.txt
+         dir2/
+          subdir1/
+           file3.txt
+          subdir2/
+         file4.txt
         ... that reflects the following directory structure:
         project_root
         ├── dir1
@@ -29,11 +23,12 @@ class SystemPrompts(Enum):
         │   │   └── file3.txt
         │   └── subdir2
         └── file4.txt
+        The path from project root of file3.txt is project_root/dir2/subdir1/file3.txt.
 
         You are to analyze each file and create new file content based on the following user prompt:
         {% prompt %}
 
-        Before doing so, you will receive the JSON template of the directory structure and the user prompt.
+        Before doing so, you will receive the template of the directory structure and the user prompt.
         Take the opportunity to analyze the directory structure and prompt, and ask for additional file content if needed, 
         just to get a high-level overview of the project.
         When you ask, only prompt for one file at a time, responding with:
@@ -74,6 +69,8 @@ class SystemPrompts(Enum):
     FILE_CONTENT:<file_content>
     FILE_ACTION:<file_action>
 
+    A FILE_DEPENDENCIES:<signatures> section may precede FILE_ACTION. It lists the public signatures of project files imported by FILE_PATH, as they are after being edited. Keep every usage of them in FILE_CONTENT consistent with these signatures.
+
     When provided with such a file, analyze the FILE_PATH and FILE_CONTENT to suggest an entirely new FILE_CONTENT based on FILE_ACTION, if needed. 
     Ensure that your suggestions follow best practices for the given file type, maintain high code quality, and adhere to relevant standards and conventions.
 
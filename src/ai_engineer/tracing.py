@@ -0,0 +1,130 @@
+"""
+Lightweight span tracing that exports Chrome trace-event JSON.
+
+Spans are no-ops until the tracer is enabled, so instrumentation can stay on
+the hot paths. Load the exported file in chrome://tracing or https://ui.perfetto.dev.
+"""
+
+import functools
+import json
+import logging
+import os
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+
+class _NullSpan:
+    """Span returned while tracing is disabled."""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class _Span:
+    """Span recording a complete ("X") trace event on exit."""
+
+    def __init__(self, tracer, name, category, args):
+        self.tracer = tracer
+        self.name = name
+        self.category = category
+        self.args = args
+        self.start = None
+
+    def __enter__(self):
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc_info):
+        end = time.perf_counter_ns()
+        event = {
+            "name": self.name,
+            "cat": self.category,
+            "ph": "X",
+            "ts": (self.start - self.tracer.origin) / 1000,
+            "dur": (end - self.start) / 1000,
+            "pid": os.getpid(),
+            "tid": threading.get_ident(),
+        }
+        if self.args:
+            event["args"] = self.args
+        self.tracer.events.append(event)
+        return False
+
+
+class Tracer:
+    """
+    Collects spans and exports them in Chrome trace-event format.
+
+    Attributes:
+        enabled (bool): Whether spans are recorded.
+        events (list): Recorded trace events.
+        origin (int): perf_counter_ns timestamp the trace is relative to.
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self.events = []
+        self.origin = time.perf_counter_ns()
+
+    def enable(self):
+        """Start recording spans, discarding any previous events."""
+        self.events = []
+        self.origin = time.perf_counter_ns()
+        self.enabled = True
+
+    def disable(self):
+        """Stop recording spans."""
+        self.enabled = False
+
+    def span(self, name, category="ai_engineer", **args):
+        """
+        Create a span to be used as a context manager.
+
+        Args:
+            name (str): Name of the span.
+            category (str, optional): Trace-event category, e.g. the phase.
+            **args: Extra details shown with the event.
+
+        Returns:
+            A context manager timing its block.
+        """
+        if not self.enabled:
+            return _NULL_SPAN
+        return _Span(self, name, category, args)
+
+    def traced(self, category="ai_engineer"):
+        """Decorator wrapping every call of a function in a span."""
+
+        def decorator(func):
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                if not self.enabled:
+                    return func(*args, **kwargs)
+                with _Span(self, func.__qualname__, category, None):
+                    return func(*args, **kwargs)
+
+            return wrapper
+
+        return decorator
+
+    def export(self, file_path):
+        """
+        Export the recorded spans as a Chrome trace-event JSON file.
+
+        Args:
+            file_path (str): Path of the trace file.
+        """
+        with open(file_path, "w+", encoding="utf-8") as f:
+            json.dump({"traceEvents": self.events, "displayTimeUnit": "ms"}, f)
+        logger.info("Exported %d trace events to: %s", len(self.events), file_path)
+
+
+tracer = Tracer()
@@ -0,0 +1,89 @@
+"""
+The Validator class checks generated files for syntax errors before they are
+accepted, so that only the failing files need to be requested again.
+"""
+
+import json
+import logging
+import os
+import tomllib
+from concurrent.futures import ProcessPoolExecutor
+
+try:
+    import yaml
+except ImportError:  # pragma: no cover - optional dependency
+    yaml = None
+
+logger = logging.getLogger(__name__)
+
+
+class Validator:
+    """
+    Syntax validation of generated file contents.
+
+    Python files are compiled, JSON, TOML and YAML files are parsed. YAML is
+    only checked when PyYAML is installed. Other file types always pass.
+    """
+
+    # Below this many files a process pool costs more than it saves
+    PROCESS_POOL_MIN_FILES = 8
+
+    @staticmethod
+    def ai_engineer_validate_content(file_path, content):
+        """
+        Validate the content of a single file based on its extension.
+
+        Args:
+            file_path (str): Path of the file, used to pick the check.
+            content (str): Generated file content.
+
+        Returns:
+            str: The validation error, or None if the content is valid.
+        """
+        extension = os.path.splitext(file_path)[1].lower()
+        try:
+            if extension == ".py":
+                compile(content, file_path, "exec", dont_inherit=True)
+            elif extension == ".json":
+                json.loads(content)
+            elif extension == ".toml":
+                tomllib.loads(content)
+            elif extension in (".yaml", ".yml") and yaml is not None:
+                list(yaml.safe_load_all(content))
+        except SyntaxError as e:
+            return f"{type(e).__name__}: {e.msg} (line {e.lineno})"
+        except Exception as e:  # pylint: disable=broad-except
+            return f"{type(e).__name__}: {e}"
+        return None
+
+    @classmethod
+    def ai_engineer_validate_files(cls, files, max_workers=None):
+        """
+        Validate many files, in a process pool when there are enough of them.
+
+        Args:
+            files (dict): Maps file paths to their generated content.
+            max_workers (int, optional): Size of the process pool.
+
+        Returns:
+            dict: Maps each failing file path to its validation error.
+        """
+        file_paths = list(files)
+        contents = [files[file_path] for file_path in file_paths]
+        if len(file_paths) < cls.PROCESS_POOL_MIN_FILES:
+            errors = list(map(cls.ai_engineer_validate_content, file_paths, contents))
+        else:
+            with ProcessPoolExecutor(max_workers=max_workers) as executor:
+                errors = list(
+                    executor.map(
+                        cls.ai_engineer_validate_content,
+                        file_paths,
+                        contents,
+                        chunksize=16,
+                    )
+                )
+        return {
+            file_path: error
+            for file_path, error in zip(file_paths, errors)
+            if error is not None
+        }
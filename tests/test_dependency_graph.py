@@ -0,0 +1,83 @@
+from ai_engineer.dependency_graph import DependencyGraph
+
+
+def make_project(tmp_path, files):
+    for path, content in files.items():
+        file_path = tmp_path / path
+        file_path.parent.mkdir(parents=True, exist_ok=True)
+        file_path.write_text(content, encoding="utf-8")
+    return DependencyGraph(str(tmp_path), [f"project_root/{path}" for path in files])
+
+
+def test_levels_order_callees_before_callers(tmp_path):
+    graph = make_project(
+        tmp_path,
+        {
+            "pkg/__init__.py": "",
+            "pkg/base.py": "VALUE = 1\n",
+            "pkg/service.py": "from pkg.base import VALUE\n",
+            "pkg/api.py": "from . import service\n",
+            "README.md": "import pkg.api\n",
+        },
+    )
+
+    assert graph.ai_engineer_levels() == [
+        [
+            "project_root/pkg/__init__.py",
+            "project_root/pkg/base.py",
+            "project_root/README.md",
+        ],
+        ["project_root/pkg/service.py"],
+        ["project_root/pkg/api.py"],
+    ]
+
+
+def test_import_cycle_is_kept_in_one_level(tmp_path):
+    graph = make_project(
+        tmp_path,
+        {
+            "a.py": "import b\n",
+            "b.py": "import c\n",
+            "c.py": "import a\nimport util\n",
+            "util.py": "",
+            "main.py": "from a import run\n",
+        },
+    )
+
+    levels = graph.ai_engineer_levels()
+    assert [sorted(level) for level in levels] == [
+        ["project_root/util.py"],
+        ["project_root/a.py", "project_root/b.py", "project_root/c.py"],
+        ["project_root/main.py"],
+    ]
+
+
+def test_unparsable_file_has_no_dependencies(tmp_path):
+    graph = make_project(tmp_path, {"a.py": "import b\ndef broken(:\n", "b.py": ""})
+
+    assert graph.dependencies["project_root/a.py"] == set()
+    assert len(graph.ai_engineer_levels()) == 1
+
+
+def test_public_signatures():
+    source = (
+        "import os\n"
+        "class Client:\n"
+        "    def get(self, key: str) -> str:\n"
+        "        return key\n"
+        "    def _private(self):\n"
+        "        pass\n"
+        "def helper(a, b=1):\n"
+        "    return a\n"
+        "def _hidden():\n"
+        "    pass\n"
+    )
+
+    signatures = DependencyGraph.ai_engineer_public_signatures(source)
+
+    assert "class Client" in signatures
+    assert "def get(self, key: str) -> str" in signatures
+    assert "def helper(a, b=1)" in signatures
+    assert "_private" not in signatures
+    assert "_hidden" not in signatures
+    assert DependencyGraph.ai_engineer_public_signatures("def broken(:") == ""
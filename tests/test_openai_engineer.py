@@ -0,0 +1,189 @@
+import os
+from types import SimpleNamespace
+
+import pytest
+
+from ai_engineer.services import OpenAIEngineer
+
+
+def reply(file_path_mask, content):
+    return f"FILE_PATH:{file_path_mask}\nFILE_CONTENT:\n```\n{content}\n```"
+
+
+def completion(content):
+    return SimpleNamespace(
+        choices=[SimpleNamespace(message=SimpleNamespace(content=content))],
+        usage=None,
+    )
+
+
+@pytest.fixture
+def engineer(monkeypatch):
+    engineer = OpenAIEngineer(api_key="test")
+    engineer.requests = []
+
+    def stub(respond):
+        def create(model, messages):
+            messages = list(messages)
+            engineer.requests.append(messages)
+            return completion(respond(messages))
+
+        monkeypatch.setattr(engineer.chat.completions, "create", create)
+
+    engineer.stub = stub
+    return engineer
+
+
+def test_creator_retries_failing_file_in_the_same_chat(engineer, tmp_path):
+    replies = iter(
+        [
+            reply("project_root/a.py", "def f(:\n"),
+            reply("project_root/a.py", "def f():\n    pass\n"),
+            reply("project_root/b.json", "{"),
+            reply("project_root/b.json", "{"),
+            "AI-ENGINEER:DONE",
+        ]
+    )
+    engineer.stub(lambda messages: next(replies))
+
+    engineer.ai_engineer_project_tree_prompt(
+        str(tmp_path),
+        "Create a project",
+        "creator",
+        gitignore_file_path=".gitignore",
+        max_validation_retries=1,
+    )
+
+    retry = engineer.requests[1][-1]["content"]
+    assert retry.startswith("FILE_PATH:project_root/a.py\nFILE_VALIDATION_ERROR:")
+    assert engineer.requests[1][-2]["content"] == reply(
+        "project_root/a.py", "def f(:\n"
+    )
+    assert (tmp_path / "a.py.ai_engineer").read_text() == "def f():\n    pass\n"
+    assert not os.path.exists(tmp_path / "b.json.ai_engineer")
+    report = engineer.ai_engineer_validation_report
+    assert report["checked"] == 2
+    assert report["failed"] == 2
+    assert report["fixed"] == 1
+    assert report["retries"] == 2
+    assert set(report["errors"]) == {"project_root/b.json"}
+
+
+def make_project(tmp_path, files):
+    for path, content in files.items():
+        (tmp_path / path).parent.mkdir(parents=True, exist_ok=True)
+        (tmp_path / path).write_text(content, encoding="utf-8")
+    (tmp_path / ".gitignore").write_text("", encoding="utf-8")
+
+
+def requested_file(messages):
+    """The file path and whether the request is a validation retry."""
+    content = messages[-1]["content"]
+    return (
+        content.split("\n", 1)[0].removeprefix("FILE_PATH:"),
+        "FILE_VALIDATION_ERROR:" in content,
+    )
+
+
+def test_editor_retries_and_writes_only_valid_files(engineer, tmp_path):
+    make_project(
+        tmp_path,
+        {"fixed.py": "x = 1\n", "broken.py": "y = 1\n", "valid.json": "{}\n"},
+    )
+
+    def respond(messages):
+        file_path_mask, retry = requested_file(messages)
+        if file_path_mask == "project_root/valid.json":
+            return reply(file_path_mask, '{"a": 1}')
+        if file_path_mask == "project_root/fixed.py" and retry:
+            return reply(file_path_mask, "x = 2")
+        return reply(file_path_mask, "def f(:")
+
+    engineer.stub(respond)
+
+    engineer.ai_engineer_project_tree_prompt(
+        str(tmp_path),
+        "Edit the project",
+        "editor",
+        gitignore_file_path=".gitignore",
+        concurrency=4,
+        max_validation_retries=2,
+    )
+
+    requests = sorted(map(requested_file, engineer.requests))
+    assert requests == [
+        ("project_root/broken.py", False),
+        ("project_root/broken.py", True),
+        ("project_root/broken.py", True),
+        ("project_root/fixed.py", False),
+        ("project_root/fixed.py", True),
+        ("project_root/valid.json", False),
+    ]
+    for messages in engineer.requests:
+        if requested_file(messages)[1]:
+            assert messages[-2]["content"] == reply(
+                requested_file(messages)[0], "def f(:"
+            )
+    assert (tmp_path / "fixed.py.ai_engineer").read_text() == "x = 2"
+    assert (tmp_path / "valid.json.ai_engineer").read_text() == '{"a": 1}'
+    assert not os.path.exists(tmp_path / "broken.py.ai_engineer")
+    report = engineer.ai_engineer_validation_report
+    assert report["failed"] == 2
+    assert report["fixed"] == 1
+    assert report["retries"] == 3
+    assert set(report["errors"]) == {"project_root/broken.py"}
+
+
+def test_editor_duplicates_share_the_representative_edit(engineer, tmp_path):
+    make_project(
+        tmp_path,
+        {
+            "a/util.py": "x = 1\n",
+            "b/util.py": "x = 1\n",
+            "c/util.py": "x = 1\n",
+            "a/broken.py": "y = 1\n",
+            "b/broken.py": "y = 1\n",
+            "main.py": "z = 1\n",
+        },
+    )
+
+    def respond(messages):
+        file_path_mask, _ = requested_file(messages)
+        if file_path_mask.endswith("broken.py"):
+            return reply(file_path_mask, "def f(:")
+        return reply(file_path_mask, f"edited = {file_path_mask!r}")
+
+    engineer.stub(respond)
+
+    engineer.ai_engineer_project_tree_prompt(
+        str(tmp_path),
+        "Edit the project",
+        "editor",
+        gitignore_file_path=".gitignore",
+        concurrency=4,
+        max_validation_retries=1,
+        dedup_identical_files=True,
+    )
+
+    requests = [requested_file(messages)[0] for messages in engineer.requests]
+    util_requests = {path for path in requests if path.endswith("util.py")}
+    assert len(util_requests) == 1
+    assert len({path for path in requests if path.endswith("broken.py")}) == 1
+    assert len(requests) == 4
+    representative_edit = f"edited = {util_requests.pop()!r}"
+    for directory in ("a", "b", "c"):
+        assert (
+            tmp_path / directory / "util.py.ai_engineer"
+        ).read_text() == representative_edit
+    assert not os.path.exists(tmp_path / "a" / "broken.py.ai_engineer")
+    assert not os.path.exists(tmp_path / "b" / "broken.py.ai_engineer")
+    assert engineer.ai_engineer_dedup_report == {
+        "files": 6,
+        "requests": 3,
+        "duplicates": 3,
+        "duplicate_groups": 2,
+    }
+    assert set(engineer.ai_engineer_validation_report["errors"]) == {
+        "project_root/a/broken.py",
+        "project_root/b/broken.py",
+    }
@@ -0,0 +1,142 @@
+import os
+import stat
+import threading
+
+import pytest
+
+from ai_engineer.output_writer import UTF8_BOM, OutputWriter
+
+
+def close_in_thread(writer, timeout=10):
+    """Close a writer, failing instead of hanging if the worker is stuck."""
+    errors = []
+
+    def close():
+        try:
+            writer.close()
+        except Exception as e:  # pylint: disable=broad-except
+            errors.append(e)
+
+    thread = threading.Thread(target=close, daemon=True)
+    thread.start()
+    thread.join(timeout)
+    assert not thread.is_alive(), "OutputWriter.close() did not return"
+    return errors
+
+
+def read(path):
+    with open(path, "r", encoding="utf-8") as f:
+        return f.read()
+
+
+def test_writes_files_and_creates_directories(tmp_path):
+    writer = OutputWriter()
+    for index in range(50):
+        writer.submit(str(tmp_path / "pkg" / f"mod_{index}.py"), f"x = {index}\n")
+    assert close_in_thread(writer) == []
+
+    assert sorted(os.listdir(tmp_path / "pkg")) == sorted(
+        f"mod_{index}.py" for index in range(50)
+    )
+    assert read(tmp_path / "pkg" / "mod_7.py") == "x = 7\n"
+
+
+def test_later_submit_wins(tmp_path):
+    target = str(tmp_path / "a.py")
+    writer = OutputWriter()
+    writer.submit(target, "first\n")
+    writer.submit(target, "second\n")
+    assert close_in_thread(writer) == []
+    assert read(target) == "second\n"
+
+
+def test_keeps_mode_and_byte_order_mark_of_existing_file(tmp_path):
+    target = tmp_path / "run.json"
+    target.write_bytes(UTF8_BOM + b"{}\n")
+    os.chmod(target, 0o750)
+
+    writer = OutputWriter()
+    writer.submit(str(target), '{"a": 1}\n')
+    assert close_in_thread(writer) == []
+
+    assert stat.S_IMODE(os.stat(target).st_mode) == 0o750
+    assert target.read_bytes() == UTF8_BOM + b'{"a": 1}\n'
+
+
+def test_copy_keeps_mode_of_source_file(tmp_path):
+    source = tmp_path / "script.py"
+    source.write_text("print(1)\n", encoding="utf-8")
+    os.chmod(source, 0o755)
+
+    writer = OutputWriter()
+    writer.submit(f"{source}.ai_engineer", "print(2)\n", str(source))
+    assert close_in_thread(writer) == []
+
+    assert stat.S_IMODE(os.stat(f"{source}.ai_engineer").st_mode) == 0o755
+    assert read(source) == "print(1)\n"
+
+
+def test_new_file_gets_mode_of_umask(tmp_path):
+    umask = os.umask(0o027)
+    try:
+        writer = OutputWriter()
+        writer.submit(str(tmp_path / "new.py"), "x = 1\n")
+        assert close_in_thread(writer) == []
+    finally:
+        os.umask(umask)
+
+    assert stat.S_IMODE(os.stat(tmp_path / "new.py").st_mode) == 0o640
+
+
+def test_failing_file_does_not_hang_or_stop_the_others(tmp_path):
+    writer = OutputWriter()
+    writer.submit(str(tmp_path / "bad.py"), "x = '\ud800'\n")
+    writer.submit(str(tmp_path / "good.py"), "x = 1\n")
+    errors = close_in_thread(writer)
+
+    assert len(errors) == 1
+    assert isinstance(errors[0], UnicodeEncodeError)
+    assert os.listdir(tmp_path) == ["good.py"]
+
+
+def test_staged_outputs_are_applied_on_close(tmp_path):
+    target = tmp_path / "a.py"
+    target.write_text("old\n", encoding="utf-8")
+
+    writer = OutputWriter(staged=True)
+    writer.submit(str(target), "new\n")
+    writer.submit(str(tmp_path / "b.py"), "b\n")
+    writer.queue.join()
+    assert read(target) == "old\n"
+    assert not (tmp_path / "b.py").exists()
+
+    assert close_in_thread(writer) == []
+    assert read(target) == "new\n"
+    assert sorted(os.listdir(tmp_path)) == ["a.py", "b.py"]
+
+
+def test_staged_outputs_are_discarded_on_abort(tmp_path):
+    target = tmp_path / "a.py"
+    target.write_text("old\n", encoding="utf-8")
+
+    writer = OutputWriter(staged=True)
+    writer.submit(str(target), "new\n")
+    writer.submit(str(target), "newer\n")
+    writer.abort()
+
+    assert read(target) == "old\n"
+    assert os.listdir(tmp_path) == ["a.py"]
+
+
+@pytest.mark.parametrize("fsync", OutputWriter.FSYNC_POLICIES)
+@pytest.mark.parametrize("staged", [False, True])
+def test_fsync_policies(tmp_path, fsync, staged):
+    writer = OutputWriter(fsync=fsync, staged=staged)
+    writer.submit(str(tmp_path / "a.py"), "a\n")
+    assert close_in_thread(writer) == []
+    assert read(tmp_path / "a.py") == "a\n"
+
+
+def test_unknown_fsync_policy():
+    with pytest.raises(ValueError):
+        OutputWriter(fsync="sometimes")
@@ -0,0 +1,33 @@
+import pytest
+
+from ai_engineer.services import OpenAIPlanner
+
+
+def plan(planner):
+    requests = [
+        {"label": f"edit#{index}", "input_tokens": 1000, "output_tokens": 80}
+        for index in range(4)
+    ]
+    return planner.ai_engineer_summarise_plan(requests, [], {})
+
+
+def test_rate_limits_bound_wall_clock():
+    # Four sequential requests of 2 s each
+    assert plan(OpenAIPlanner(requests_per_minute=0, tokens_per_minute=0))[
+        "wall_clock_seconds"
+    ] == pytest.approx(8.0)
+    assert plan(OpenAIPlanner(requests_per_minute=6, tokens_per_minute=0))[
+        "wall_clock_seconds"
+    ] == pytest.approx(40.0)
+    assert plan(OpenAIPlanner(requests_per_minute=0, tokens_per_minute=4320))[
+        "wall_clock_seconds"
+    ] == pytest.approx(60.0)
+
+
+@pytest.mark.parametrize("requests_per_minute, tokens_per_minute", [(-1, 0), (0, -1)])
+def test_rejects_negative_rate_limits(requests_per_minute, tokens_per_minute):
+    with pytest.raises(ValueError):
+        OpenAIPlanner(
+            requests_per_minute=requests_per_minute,
+            tokens_per_minute=tokens_per_minute,
+        )
@@ -0,0 +1,142 @@
+import os
+
+import pytest
+
+from ai_engineer.core import Core
+
+
+def legacy_build_dir_structure(core, root_dir, ignore_file_path=""):
+    """The nested dictionary walk that ProjectTree replaced."""
+    dir_structure = {}
+    ignore_patterns = ["ai_engineer_output*", ".gitignore"]
+    if ignore_file_path and os.path.exists(ignore_file_path):
+        ignore_patterns.extend(core.ai_engineer_read_ignore_file(ignore_file_path))
+
+    for dirpath, dirnames, filenames in os.walk(root_dir):
+        rel_path = os.path.relpath(dirpath, root_dir)
+        current_level = dir_structure
+        for part in rel_path.split(os.sep):
+            if part != ".":
+                current_level = current_level.setdefault(part, {})
+        dirnames[:] = [
+            d
+            for d in dirnames
+            if not core.ai_engineer_should_ignore(
+                os.path.join(rel_path, d) if rel_path != "." else d, ignore_patterns
+            )
+        ]
+        for filename in filenames:
+            if not core.ai_engineer_should_ignore(
+                os.path.join(rel_path, filename) if rel_path != "." else filename,
+                ignore_patterns,
+            ):
+                current_level[filename] = None
+    return {"project_root": dir_structure}
+
+
+def legacy_flatten_dir_structure(dir_structure, base_path=""):
+    """The recursive flattening that the iterative version replaced."""
+    flat_dict = {}
+    for name, content in dir_structure.items():
+        current_path = os.path.join(base_path, name)
+        if isinstance(content, dict) and content:
+            flat_dict.update(legacy_flatten_dir_structure(content, current_path))
+        else:
+            flat_dict[current_path] = content
+    return flat_dict
+
+
+def decode(encoded):
+    """Parse the indented encoding back into the nested dictionary format."""
+    root = {}
+    stack = [(-1, root)]
+    for line in encoded.splitlines():
+        depth = len(line) - len(line.lstrip(" "))
+        name = line.strip()
+        while stack[-1][0] >= depth:
+            stack.pop()
+        parent = stack[-1][1]
+        if name.endswith("/"):
+            parent[name[:-1]] = {}
+            stack.append((depth, parent[name[:-1]]))
+        else:
+            parent[name] = None
+    return root
+
+
+@pytest.fixture
+def project(tmp_path):
+    files = [
+        "setup.py",
+        "README.md",
+        "src/pkg/__init__.py",
+        "src/pkg/core.py",
+        "src/pkg/sub/__init__.py",
+        "src/pkg/sub/deep/leaf.json",
+        "tests/__init__.py",
+        "tests/test_core.py",
+        "build/lib/pkg.py",
+        "ai_engineer_output/history.json",
+        ".gitignore",
+        "notes.log",
+    ]
+    for path in files:
+        (tmp_path / path).parent.mkdir(parents=True, exist_ok=True)
+        (tmp_path / path).write_text("", encoding="utf-8")
+    (tmp_path / "docs" / "empty").mkdir(parents=True)
+    (tmp_path / ".ignore").write_text("build\n*.log\n", encoding="utf-8")
+    return tmp_path
+
+
+def test_dir_structure_matches_legacy_walk(project):
+    core = Core()
+    ignore_file_path = str(project / ".ignore")
+
+    assert core.ai_engineer_build_dir_structure(
+        str(project), ignore_file_path
+    ) == legacy_build_dir_structure(core, str(project), ignore_file_path)
+
+
+def test_flatten_matches_legacy_recursion(project):
+    core = Core()
+    dir_structure = core.ai_engineer_build_dir_structure(
+        str(project), str(project / ".ignore")
+    )
+
+    assert core.ai_engineer_flatten_dir_structure(
+        dir_structure
+    ) == legacy_flatten_dir_structure(dir_structure)
+
+
+def test_encode_round_trips_to_dir_structure(project):
+    core = Core()
+    project_tree = core.ai_engineer_build_project_tree(
+        str(project), str(project / ".ignore")
+    )
+
+    assert (
+        decode(project_tree.ai_engineer_encode()) == project_tree.ai_engineer_to_dict()
+    )
+    assert project_tree.ai_engineer_to_dict() == legacy_build_dir_structure(
+        core, str(project), str(project / ".ignore")
+    )
+
+
+def test_file_paths_and_digests(project):
+    (project / "setup.py").write_text("x = 1\n", encoding="utf-8")
+    (project / "tests" / "test_core.py").write_text("x = 1\n", encoding="utf-8")
+    project_tree = Core().ai_engineer_build_project_tree(
+        str(project), str(project / ".ignore"), hash_contents=True
+    )
+
+    file_paths = set(project_tree.ai_engineer_file_paths())
+    assert "project_root/src/pkg/sub/deep/leaf.json" in file_paths
+    assert "project_root/build/lib/pkg.py" not in file_paths
+    assert "project_root/notes.log" not in file_paths
+
+    digests = project_tree.ai_engineer_file_digests()
+    assert set(digests) == file_paths
+    assert (
+        digests["project_root/setup.py"] == digests["project_root/tests/test_core.py"]
+    )
+    assert digests["project_root/setup.py"] != digests["project_root/README.md"]
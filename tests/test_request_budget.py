@@ -0,0 +1,47 @@
+import threading
+import time
+
+import pytest
+
+from ai_engineer.request_budget import RequestBudget
+
+
+def test_caps_requests_in_flight():
+    budget = RequestBudget(max_concurrency=2, requests_per_minute=0)
+    in_flight = []
+    peak = []
+    lock = threading.Lock()
+
+    def request():
+        with budget:
+            with lock:
+                in_flight.append(1)
+                peak.append(len(in_flight))
+            time.sleep(0.02)
+            with lock:
+                in_flight.pop()
+
+    threads = [threading.Thread(target=request) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert max(peak) == 2
+
+
+def test_paces_requests():
+    budget = RequestBudget(max_concurrency=4, requests_per_minute=1200)
+    start = time.monotonic()
+    for _ in range(4):
+        with budget:
+            pass
+
+    # Three intervals of 50 ms after the first request
+    assert time.monotonic() - start >= 0.14
+
+
+@pytest.mark.parametrize("max_concurrency, requests_per_minute", [(0, 500), (4, -1)])
+def test_rejects_invalid_limits(max_concurrency, requests_per_minute):
+    with pytest.raises(ValueError):
+        RequestBudget(max_concurrency, requests_per_minute)
@@ -0,0 +1,23 @@
+from ai_engineer.validation import Validator
+
+
+def test_validate_content():
+    assert Validator.ai_engineer_validate_content("a.py", "x = 1\n") is None
+    assert Validator.ai_engineer_validate_content("a.py", "def f(:\n").startswith(
+        "SyntaxError"
+    )
+    assert Validator.ai_engineer_validate_content("a.json", '{"a": 1}') is None
+    assert Validator.ai_engineer_validate_content("a.json", "{a}") is not None
+    assert Validator.ai_engineer_validate_content("a.toml", 'a = "b"\n') is None
+    assert Validator.ai_engineer_validate_content("a.toml", "a = \n") is not None
+    assert Validator.ai_engineer_validate_content("a.txt", "def f(:") is None
+
+
+def test_validate_files_in_process_pool():
+    files = {f"mod_{index}.py": f"x = {index}\n" for index in range(10)}
+    files["broken.py"] = "def f(:\n"
+    files["broken.json"] = "{"
+
+    errors = Validator.ai_engineer_validate_files(files, max_workers=2)
+
+    assert set(errors) == {"broken.py", "broken.json"}